@@ -1,5 +1,16 @@
 import os
-from typing import Dict, List
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+# 环境变量缓存，进程内只读取一次
+_ENV_CACHE: Dict[str, str] = {}
+
+def _getenv(key: str, default: str) -> str:
+    """读取环境变量（带缓存）"""
+    if key not in _ENV_CACHE:
+        _ENV_CACHE[key] = os.environ.get(key, default)
+    return _ENV_CACHE[key]
 
 class Config:
     """应用配置类"""
@@ -7,11 +18,20 @@ class Config:
     # 基础配置
     APP_NAME = "AI简历助手"
     APP_VERSION = "1.0.0"
-    DEBUG = os.getenv("DEBUG", "False").lower() == "true"
+    DEBUG = _getenv("DEBUG", "False").lower() == "true"
+    # 运行环境：development / production / testing
+    ENVIRONMENT = _getenv("ENVIRONMENT", "development").lower()
     
     # 服务器配置
-    HOST = os.getenv("HOST", "0.0.0.0")
-    PORT = int(os.getenv("PORT", 8000))
+    HOST = _getenv("HOST", "0.0.0.0")
+    PORT = int(_getenv("PORT", "8000"))
+    # 服务器工作进程数；各工作进程内的进程池按此平分CPU核数，避免多个工作进程叠加后进程数远超核数
+    WORKERS = int(_getenv("WORKERS", str(max(2, os.cpu_count() or 1))))
+    PROCESS_POOL_WORKERS = max(1, (os.cpu_count() or 1) // WORKERS)
+    # 离线批量生成/批量优化进程池的默认进程数（不在服务请求路径中，可使用全部CPU核数）
+    BATCH_WORKERS = int(_getenv("BATCH_WORKERS", str(os.cpu_count() or 2)))
+    # 允许跨域访问的前端域名（环境变量 CORS_ORIGINS，逗号分隔）
+    CORS_ORIGINS = _getenv("CORS_ORIGINS", "http://localhost:8000").split(",")
     
     # 文件配置
     MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
@@ -19,6 +39,9 @@ class Config:
     UPLOAD_DIR = "uploads"
     OUTPUT_DIR = "outputs"
     TEMPLATES_DIR = "templates"
+    # 部署在 nginx 之后时，设置为对应的 internal location（如 /protected），
+    # 由 nginx 通过 sendfile 直接发送下载文件；为空时由应用进程发送
+    DOWNLOAD_ACCEL_REDIRECT = _getenv("DOWNLOAD_ACCEL_REDIRECT", "").rstrip("/")
     
     # 简历解析配置
     RESUME_PARSING = {
@@ -140,17 +163,24 @@ class Config:
             "Django", "Flask", "Spring", "Laravel", "Rails", "ASP.NET"
         ],
         "databases": [
-            "MySQL", "PostgreSQL", "MongoDB", "Redis", "SQLite", "Oracle",
+            "SQL", "MySQL", "PostgreSQL", "MongoDB", "Redis", "SQLite", "Oracle",
             "SQL Server", "Elasticsearch", "Cassandra", "DynamoDB"
         ],
         "cloud_platforms": [
             "AWS", "Azure", "Google Cloud", "阿里云", "腾讯云", "华为云",
-            "Docker", "Kubernetes", "Terraform", "Ansible"
+            "Docker", "Kubernetes", "Terraform", "Ansible", "云计算"
         ],
         "data_science": [
             "Machine Learning", "Deep Learning", "Data Analysis", "Statistics",
             "TensorFlow", "PyTorch", "Pandas", "NumPy", "Scikit-learn",
-            "Tableau", "Power BI", "Jupyter", "数据分析", "机器学习"
+            "Tableau", "Power BI", "Jupyter", "数据分析", "机器学习",
+            "AI", "Hadoop", "Spark"
+        ],
+        "operating_systems": [
+            "Linux", "Windows", "macOS"
+        ],
+        "methodologies": [
+            "DevOps", "CI/CD", "Agile", "Scrum"
         ],
         "tools": [
             "Git", "GitHub", "GitLab", "JIRA", "Confluence", "Jenkins",
@@ -158,22 +188,49 @@ class Config:
         ]
     }
     
+    # 技能关键词缓存（SKILL_KEYWORDS 运行期不变，首次调用时构建）
+    _ALL_SKILLS_ORDERED: Optional[Tuple[str, ...]] = None
+    _ALL_SKILLS: Optional[FrozenSet[str]] = None
+    _ALL_SKILLS_LOWER: Optional[FrozenSet[str]] = None
+    
+    @classmethod
+    def _build_skill_cache(cls):
+        """构建技能关键词缓存，去重并保持 SKILL_KEYWORDS 中的先后顺序"""
+        if cls._ALL_SKILLS_ORDERED is None:
+            ordered = tuple(dict.fromkeys(chain.from_iterable(cls.SKILL_KEYWORDS.values())))
+            cls._ALL_SKILLS = frozenset(ordered)
+            cls._ALL_SKILLS_LOWER = frozenset(skill.lower() for skill in ordered)
+            cls._ALL_SKILLS_ORDERED = ordered
+    
+    @classmethod
+    def get_skill_set(cls) -> FrozenSet[str]:
+        """获取去重后的技能关键词集合（缓存）"""
+        cls._build_skill_cache()
+        return cls._ALL_SKILLS
+    
+    @classmethod
+    def get_skill_set_lower(cls) -> FrozenSet[str]:
+        """获取小写形式的技能关键词集合，用于不区分大小写的匹配"""
+        cls._build_skill_cache()
+        return cls._ALL_SKILLS_LOWER
+    
     @classmethod
     def get_all_skills(cls) -> List[str]:
         """获取所有技能关键词"""
-        all_skills = []
-        for category in cls.SKILL_KEYWORDS.values():
-            all_skills.extend(category)
-        return list(set(all_skills))
+        cls._build_skill_cache()
+        return list(cls._ALL_SKILLS_ORDERED)
     
     @classmethod
     def get_config_dict(cls) -> Dict:
         """获取配置字典"""
-        config = {}
-        for attr_name in dir(cls):
-            if not attr_name.startswith('_') and not callable(getattr(cls, attr_name)):
-                config[attr_name] = getattr(cls, attr_name)
-        return config
+        # 反射结果按配置类缓存（子类会覆盖部分配置，不能共用父类的结果）
+        if '_CONFIG_DICT' not in cls.__dict__:
+            config = {}
+            for attr_name in dir(cls):
+                if not attr_name.startswith('_') and not callable(getattr(cls, attr_name)):
+                    config[attr_name] = getattr(cls, attr_name)
+            cls._CONFIG_DICT = config
+        return dict(cls._CONFIG_DICT)
     
     @classmethod
     def validate_config(cls) -> bool:
@@ -222,9 +279,10 @@ class TestingConfig(Config):
     TEMPLATES_DIR = "test_templates"
 
 # 根据环境变量选择配置
+@lru_cache(maxsize=1)
 def get_config():
     """根据环境变量获取配置类"""
-    env = os.getenv("ENVIRONMENT", "development").lower()
+    env = Config.ENVIRONMENT
     
     if env == "production":
         return ProductionConfig
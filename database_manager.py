@@ -1,9 +1,99 @@
 import sqlite3
-import json
+import orjson
 import os
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
+# 预编译语句缓存容量（sqlite3 默认128）
+_CACHED_STATEMENTS = 256
+
+# 常用 SQL 语句定义为模块常量，配合持久连接命中 sqlite3 的语句缓存
+_HISTORY_COLUMNS = """
+    id, job_title, company_name, generation_type,
+    input_data, output_file_path, match_score,
+    optimization_suggestions, created_at
+"""
+
+_SQL_INSERT_HISTORY = """
+    INSERT INTO generation_history
+    (job_title, company_name, generation_type, input_data,
+     output_file_path, match_score, optimization_suggestions)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_SELECT_HISTORY = f"""
+    SELECT {_HISTORY_COLUMNS}
+    FROM generation_history
+    ORDER BY created_at DESC
+    LIMIT ? OFFSET ?
+"""
+
+_SQL_SELECT_BY_ID = f"""
+    SELECT {_HISTORY_COLUMNS}
+    FROM generation_history
+    WHERE id = ?
+"""
+
+_SQL_DELETE_BY_ID = 'DELETE FROM generation_history WHERE id = ?'
+
+_SQL_SEARCH_HISTORY_FTS = f"""
+    SELECT {_HISTORY_COLUMNS}
+    FROM generation_history
+    WHERE id IN (SELECT rowid FROM gh_fts WHERE gh_fts MATCH ?)
+    ORDER BY created_at DESC
+    LIMIT ?
+"""
+
+_SQL_SEARCH_HISTORY_LIKE = f"""
+    SELECT {_HISTORY_COLUMNS}
+    FROM generation_history
+    WHERE job_title LIKE ? OR company_name LIKE ?
+    ORDER BY created_at DESC
+    LIMIT ?
+"""
+
+_SQL_FILTER_BY_INPUT = f"""
+    SELECT {_HISTORY_COLUMNS}
+    FROM generation_history
+    WHERE json_extract(input_data, ?) LIKE ?
+    ORDER BY created_at DESC
+    LIMIT ?
+"""
+
+_SQL_HISTORY_SUMMARY = """
+    SELECT COUNT(*) AS total,
+           AVG(CASE WHEN match_score > 0 THEN match_score END) AS avg_score,
+           SUM(CASE WHEN created_at >= datetime('now', '-7 days') THEN 1 ELSE 0 END) AS recent
+    FROM generation_history
+"""
+
+_SQL_COUNT_BY_TYPE = """
+    SELECT generation_type, COUNT(*)
+    FROM generation_history
+    GROUP BY generation_type
+"""
+
+_SQL_UPSERT_TEMPLATE_USAGE = """
+    INSERT INTO template_usage (template_id, usage_count, last_used)
+    VALUES (?, 1, CURRENT_TIMESTAMP)
+    ON CONFLICT(template_id) DO UPDATE
+    SET usage_count = usage_count + 1, last_used = CURRENT_TIMESTAMP
+"""
+
+_SQL_SELECT_TEMPLATE_USAGE = """
+    SELECT template_id, usage_count, last_used
+    FROM template_usage
+    ORDER BY usage_count DESC
+"""
+
+_SQL_UPSERT_SETTING = """
+    INSERT OR REPLACE INTO user_settings (setting_key, setting_value, updated_at)
+    VALUES (?, ?, CURRENT_TIMESTAMP)
+"""
+
+_SQL_SELECT_SETTING = 'SELECT setting_value FROM user_settings WHERE setting_key = ?'
+
 class DatabaseManager:
     """数据库管理器，负责存储和管理简历生成历史"""
     
@@ -15,12 +105,42 @@ class DatabaseManager:
             db_path: 数据库文件路径
         """
         self.db_path = db_path
+        # 复用同一个持久连接，避免每次查询重新打开数据库文件；
+        # SQLite 本身串行化写操作，这里用锁保证多线程下对连接的独占访问
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False,
+                                     cached_statements=_CACHED_STATEMENTS)
+        self._conn.row_factory = sqlite3.Row
+        self._configure_connection()
         self._init_database()
     
+    @staticmethod
+    def _row_to_record(row: sqlite3.Row) -> Dict:
+        """将生成历史行转换为记录字典"""
+        record = dict(row)
+        input_data = record["input_data"]
+        suggestions = record["optimization_suggestions"]
+        record["input_data"] = orjson.loads(input_data) if input_data else {}
+        record["optimization_suggestions"] = orjson.loads(suggestions) if suggestions else []
+        return record
+    
+    def _configure_connection(self):
+        """设置连接级别的 PRAGMA"""
+        cursor = self._conn.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute('PRAGMA temp_store=MEMORY')
+        cursor.execute('PRAGMA mmap_size=268435456')
+    
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+    
     def _init_database(self):
         """初始化数据库表结构"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
             
             # 创建生成历史表
             cursor.execute('''
@@ -59,7 +179,101 @@ class DatabaseManager:
                 )
             ''')
             
-            conn.commit()
+            # template_id 唯一，供使用统计 UPSERT 使用（兼容已存在的旧表）
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'idx_template_usage_id'")
+            if cursor.fetchone() is None:
+                self._merge_template_usage(cursor)
+            cursor.execute('''
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_template_usage_id
+                ON template_usage(template_id)
+            ''')
+            
+            # 历史记录按创建时间倒序分页
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_gh_created
+                ON generation_history(created_at DESC)
+            ''')
+            
+            self._fts_enabled = self._init_search_index(cursor)
+    
+    @staticmethod
+    def _merge_template_usage(cursor: sqlite3.Cursor):
+        """
+        合并旧表中同一模板的重复统计行（累加使用次数，保留最近使用时间），以便建立唯一索引
+        
+        Args:
+            cursor: 数据库游标
+        """
+        cursor.execute('''
+            SELECT template_id, MIN(id), SUM(usage_count), MAX(last_used)
+            FROM template_usage
+            GROUP BY template_id
+            HAVING COUNT(*) > 1
+        ''')
+        duplicates = cursor.fetchall()
+        if not duplicates:
+            return
+        
+        cursor.executemany(
+            'DELETE FROM template_usage WHERE template_id = ? AND id != ?',
+            [(template_id, keep_id) for template_id, keep_id, _, _ in duplicates]
+        )
+        cursor.executemany(
+            'UPDATE template_usage SET usage_count = ?, last_used = ? WHERE id = ?',
+            [(usage_count, last_used, keep_id) for _, keep_id, usage_count, last_used in duplicates]
+        )
+    
+    def _init_search_index(self, cursor: sqlite3.Cursor) -> bool:
+        """
+        创建职位标题/公司名称的全文索引（FTS5 trigram），用于子串搜索
+        
+        Args:
+            cursor: 数据库游标
+            
+        Returns:
+            是否启用全文索引（SQLite 未编译 FTS5 或版本过低时返回False）
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'gh_fts'")
+        existed = cursor.fetchone() is not None
+        
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS gh_fts USING fts5(
+                    job_title, company_name,
+                    content='generation_history', content_rowid='id',
+                    tokenize='trigram'
+                )
+            ''')
+        except sqlite3.OperationalError:
+            return False
+        
+        # 触发器保持全文索引与历史表同步
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS gh_fts_ai AFTER INSERT ON generation_history BEGIN
+                INSERT INTO gh_fts(rowid, job_title, company_name)
+                VALUES (new.id, new.job_title, new.company_name);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS gh_fts_ad AFTER DELETE ON generation_history BEGIN
+                INSERT INTO gh_fts(gh_fts, rowid, job_title, company_name)
+                VALUES ('delete', old.id, old.job_title, old.company_name);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS gh_fts_au AFTER UPDATE ON generation_history BEGIN
+                INSERT INTO gh_fts(gh_fts, rowid, job_title, company_name)
+                VALUES ('delete', old.id, old.job_title, old.company_name);
+                INSERT INTO gh_fts(rowid, job_title, company_name)
+                VALUES (new.id, new.job_title, new.company_name);
+            END
+        ''')
+        
+        # 已有数据库首次建立索引时，回填历史数据
+        if not existed:
+            cursor.execute("INSERT INTO gh_fts(gh_fts) VALUES ('rebuild')")
+        
+        return True
     
     def save_generation_record(self, 
                              job_title: str,
@@ -84,27 +298,48 @@ class DatabaseManager:
         Returns:
             记录ID
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
             
-            cursor.execute('''
-                INSERT INTO generation_history 
-                (job_title, company_name, generation_type, input_data, 
-                 output_file_path, match_score, optimization_suggestions)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
+            cursor.execute(_SQL_INSERT_HISTORY, (
                 job_title,
                 company_name,
                 generation_type,
-                json.dumps(input_data, ensure_ascii=False),
+                orjson.dumps(input_data).decode('utf-8'),
                 output_file_path,
                 match_score,
-                json.dumps(optimization_suggestions or [], ensure_ascii=False)
+                orjson.dumps(optimization_suggestions or []).decode('utf-8')
             ))
             
-            record_id = cursor.lastrowid
-            conn.commit()
-            return record_id
+            return cursor.lastrowid
+    
+    def save_generation_records(self, records: List[Dict]) -> int:
+        """
+        批量保存简历生成记录（单个事务内完成，适用于历史导入/备份恢复）
+        
+        Args:
+            records: 记录列表，每条记录的键与 save_generation_record 的参数一致
+            
+        Returns:
+            写入的记录数
+        """
+        params = [
+            (
+                record["job_title"],
+                record.get("company_name"),
+                record["generation_type"],
+                orjson.dumps(record.get("input_data", {})).decode('utf-8'),
+                record.get("output_file_path"),
+                record.get("match_score", 0.0),
+                orjson.dumps(record.get("optimization_suggestions") or []).decode('utf-8')
+            )
+            for record in records
+        ]
+        
+        with self._lock, self._conn:
+            self._conn.executemany(_SQL_INSERT_HISTORY, params)
+        
+        return len(params)
     
     def get_generation_history(self, limit: int = 50, offset: int = 0) -> List[Dict]:
         """
@@ -117,34 +352,12 @@ class DatabaseManager:
         Returns:
             历史记录列表
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
             
-            cursor.execute('''
-                SELECT id, job_title, company_name, generation_type, 
-                       input_data, output_file_path, match_score, 
-                       optimization_suggestions, created_at
-                FROM generation_history
-                ORDER BY created_at DESC
-                LIMIT ? OFFSET ?
-            ''', (limit, offset))
-            
-            records = []
-            for row in cursor.fetchall():
-                record = {
-                    "id": row[0],
-                    "job_title": row[1],
-                    "company_name": row[2],
-                    "generation_type": row[3],
-                    "input_data": json.loads(row[4]) if row[4] else {},
-                    "output_file_path": row[5],
-                    "match_score": row[6],
-                    "optimization_suggestions": json.loads(row[7]) if row[7] else [],
-                    "created_at": row[8]
-                }
-                records.append(record)
-            
-            return records
+            cursor.execute(_SQL_SELECT_HISTORY, (limit, offset))
+            
+            return [self._row_to_record(row) for row in cursor.fetchall()]
     
     def get_generation_record_by_id(self, record_id: int) -> Optional[Dict]:
         """
@@ -156,31 +369,13 @@ class DatabaseManager:
         Returns:
             记录详情，如果不存在返回None
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
             
-            cursor.execute('''
-                SELECT id, job_title, company_name, generation_type, 
-                       input_data, output_file_path, match_score, 
-                       optimization_suggestions, created_at
-                FROM generation_history
-                WHERE id = ?
-            ''', (record_id,))
+            cursor.execute(_SQL_SELECT_BY_ID, (record_id,))
             
             row = cursor.fetchone()
-            if row:
-                return {
-                    "id": row[0],
-                    "job_title": row[1],
-                    "company_name": row[2],
-                    "generation_type": row[3],
-                    "input_data": json.loads(row[4]) if row[4] else {},
-                    "output_file_path": row[5],
-                    "match_score": row[6],
-                    "optimization_suggestions": json.loads(row[7]) if row[7] else [],
-                    "created_at": row[8]
-                }
-            return None
+            return self._row_to_record(row) if row else None
     
     def delete_generation_record(self, record_id: int) -> bool:
         """
@@ -192,11 +387,10 @@ class DatabaseManager:
         Returns:
             是否删除成功
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
             
-            cursor.execute('DELETE FROM generation_history WHERE id = ?', (record_id,))
-            conn.commit()
+            cursor.execute(_SQL_DELETE_BY_ID, (record_id,))
             
             return cursor.rowcount > 0
     
@@ -211,35 +405,35 @@ class DatabaseManager:
         Returns:
             匹配的历史记录列表
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
             
-            cursor.execute('''
-                SELECT id, job_title, company_name, generation_type, 
-                       input_data, output_file_path, match_score, 
-                       optimization_suggestions, created_at
-                FROM generation_history
-                WHERE job_title LIKE ? OR company_name LIKE ?
-                ORDER BY created_at DESC
-                LIMIT ?
-            ''', (f'%{keyword}%', f'%{keyword}%', limit))
-            
-            records = []
-            for row in cursor.fetchall():
-                record = {
-                    "id": row[0],
-                    "job_title": row[1],
-                    "company_name": row[2],
-                    "generation_type": row[3],
-                    "input_data": json.loads(row[4]) if row[4] else {},
-                    "output_file_path": row[5],
-                    "match_score": row[6],
-                    "optimization_suggestions": json.loads(row[7]) if row[7] else [],
-                    "created_at": row[8]
-                }
-                records.append(record)
-            
-            return records
+            # trigram 索引只能匹配至少3个字符的关键词，更短的关键词回退到 LIKE 扫描
+            if self._fts_enabled and len(keyword) >= 3:
+                cursor.execute(_SQL_SEARCH_HISTORY_FTS, ('"' + keyword.replace('"', '""') + '"', limit))
+            else:
+                cursor.execute(_SQL_SEARCH_HISTORY_LIKE, (f'%{keyword}%', f'%{keyword}%', limit))
+            
+            return [self._row_to_record(row) for row in cursor.fetchall()]
+    
+    def filter_generation_history_by_input(self, field: str, keyword: str, limit: int = 50) -> List[Dict]:
+        """
+        按输入数据中的字段过滤生成历史（由SQLite JSON1在库内过滤，无需逐条反序列化）
+        
+        Args:
+            field: 输入数据中的字段名，如 "description"
+            keyword: 搜索关键词
+            limit: 返回记录数量限制
+            
+        Returns:
+            匹配的历史记录列表
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
+            
+            cursor.execute(_SQL_FILTER_BY_INPUT, (f'$.{field}', f'%{keyword}%', limit))
+            
+            return [self._row_to_record(row) for row in cursor.fetchall()]
     
     def get_statistics(self) -> Dict:
         """
@@ -248,31 +442,19 @@ class DatabaseManager:
         Returns:
             统计数据
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
             
-            # 总生成次数
-            cursor.execute('SELECT COUNT(*) FROM generation_history')
-            total_generations = cursor.fetchone()[0]
+            # 总生成次数、平均匹配分数、最近7天的生成次数（一次扫描完成）
+            cursor.execute(_SQL_HISTORY_SUMMARY)
+            summary = cursor.fetchone()
+            total_generations = summary["total"]
+            avg_match_score = summary["avg_score"] or 0.0
+            recent_generations = summary["recent"] or 0
             
             # 按类型统计
-            cursor.execute('''
-                SELECT generation_type, COUNT(*) 
-                FROM generation_history 
-                GROUP BY generation_type
-            ''')
-            type_stats = dict(cursor.fetchall())
-            
-            # 平均匹配分数
-            cursor.execute('SELECT AVG(match_score) FROM generation_history WHERE match_score > 0')
-            avg_match_score = cursor.fetchone()[0] or 0.0
-            
-            # 最近7天的生成次数
-            cursor.execute('''
-                SELECT COUNT(*) FROM generation_history 
-                WHERE created_at >= datetime('now', '-7 days')
-            ''')
-            recent_generations = cursor.fetchone()[0]
+            cursor.execute(_SQL_COUNT_BY_TYPE)
+            type_stats = {row[0]: row[1] for row in cursor.fetchall()}
             
             return {
                 "total_generations": total_generations,
@@ -288,28 +470,10 @@ class DatabaseManager:
         Args:
             template_id: 模板ID
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # 检查是否已存在记录
-            cursor.execute('SELECT usage_count FROM template_usage WHERE template_id = ?', (template_id,))
-            result = cursor.fetchone()
-            
-            if result:
-                # 更新使用次数
-                cursor.execute('''
-                    UPDATE template_usage 
-                    SET usage_count = usage_count + 1, last_used = CURRENT_TIMESTAMP
-                    WHERE template_id = ?
-                ''', (template_id,))
-            else:
-                # 插入新记录
-                cursor.execute('''
-                    INSERT INTO template_usage (template_id, usage_count, last_used)
-                    VALUES (?, 1, CURRENT_TIMESTAMP)
-                ''', (template_id,))
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
             
-            conn.commit()
+            cursor.execute(_SQL_UPSERT_TEMPLATE_USAGE, (template_id,))
     
     def get_template_usage_stats(self) -> List[Dict]:
         """
@@ -318,24 +482,12 @@ class DatabaseManager:
         Returns:
             模板使用统计列表
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
             
-            cursor.execute('''
-                SELECT template_id, usage_count, last_used
-                FROM template_usage
-                ORDER BY usage_count DESC
-            ''')
-            
-            stats = []
-            for row in cursor.fetchall():
-                stats.append({
-                    "template_id": row[0],
-                    "usage_count": row[1],
-                    "last_used": row[2]
-                })
+            cursor.execute(_SQL_SELECT_TEMPLATE_USAGE)
             
-            return stats
+            return [dict(row) for row in cursor.fetchall()]
     
     def save_user_setting(self, key: str, value: str):
         """
@@ -345,15 +497,10 @@ class DatabaseManager:
             key: 设置键
             value: 设置值
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO user_settings (setting_key, setting_value, updated_at)
-                VALUES (?, ?, CURRENT_TIMESTAMP)
-            ''', (key, value))
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
             
-            conn.commit()
+            cursor.execute(_SQL_UPSERT_SETTING, (key, value))
     
     def get_user_setting(self, key: str, default_value: str = None) -> Optional[str]:
         """
@@ -366,10 +513,10 @@ class DatabaseManager:
         Returns:
             设置值
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
             
-            cursor.execute('SELECT setting_value FROM user_settings WHERE setting_key = ?', (key,))
+            cursor.execute(_SQL_SELECT_SETTING, (key,))
             result = cursor.fetchone()
             
             return result[0] if result else default_value
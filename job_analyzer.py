@@ -3,17 +3,107 @@
 负责从URL抓取职位信息并提取关键要求
 """
 
-import requests
-from bs4 import BeautifulSoup
+import copy
 import re
-from typing import Dict, List
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
+from config import Config
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+# requests 和 bs4 导入开销较大，仅在真正分析职位链接时才加载
+_requests = None
+_BeautifulSoup = None
+
+# HTML解析器：优先使用C实现的lxml，未安装时回退到标准库html.parser
+_HTML_PARSER = 'html.parser'
+
+# 职位分析结果缓存：同一URL在有效期内直接返回已分析的结果
+_JOB_CACHE_MAXSIZE = 128
+_JOB_CACHE_TTL = 3600  # 秒
+
+# 分词正则：与\b边界语义一致的连续单词字符
+_WORD_RE = re.compile(r'\w+')
+
+# 职位要求关键词正则，所有关键词合并后只需遍历一次DOM
+_REQ_KW_RE = re.compile(r'(?:要求|需求|requirement|qualification|资格|responsibilit|职责)', re.IGNORECASE)
+_REQ_SECTION_RE = re.compile(r'(?:要求|requirement|资格)', re.IGNORECASE)
+_REQ_TAGS = ['li', 'p', 'div']
+
+# 技能关键词统一来自配置中的技能库，匹配结构在模块导入时构建一次
+_TECH_SKILLS = tuple(Config.get_all_skills())
+
+# 单个词构成的技能（如Python、AWS）：分词后做集合查找即可
+# 两个字符以内的技能（如Go、R、AI）容易与普通单词混淆，按原始大小写匹配，
+# 且前后不能紧邻 &（排除 R&D、AI&ML 之类的缩写，HTML 中为 R&amp;D）
+_WORD_SKILLS = frozenset(
+    skill.lower() for skill in _TECH_SKILLS if _WORD_RE.fullmatch(skill) and len(skill) > 2
+)
+_SHORT_WORD_SKILLS = sorted(
+    (skill for skill in _TECH_SKILLS if _WORD_RE.fullmatch(skill) and len(skill) <= 2),
+    key=len, reverse=True
+)
+_SHORT_WORD_SKILL_RE = re.compile(
+    r'(?<![\w&])(?:' + '|'.join(re.escape(skill) for skill in _SHORT_WORD_SKILLS) + r')(?![\w&])'
+) if _SHORT_WORD_SKILLS else None
+
+# 含空格或符号的复合技能（如Machine Learning、CI/CD、C++）：合并为一个正则一次扫描
+# 较长的技能排在前面，避免被其前缀抢先匹配；
+# 正则基于小写技能编译，匹配前先整体转小写，避免IGNORECASE逐字符的额外开销
+_COMPOUND_SKILLS = sorted(
+    (skill.lower() for skill in _TECH_SKILLS if not _WORD_RE.fullmatch(skill)),
+    key=len, reverse=True
+)
+_COMPOUND_SKILL_RE = re.compile(
+    r'(?<!\w)(?:' + '|'.join(re.escape(skill) for skill in _COMPOUND_SKILLS) + r')(?!\w)'
+) if _COMPOUND_SKILLS else None
+
+# 去除<script>/<style>块及所有标签，用于直接在原始HTML上提取技能
+_TAG_STRIP_RE = re.compile(r'<(script|style)[^>]*>.*?</\1\s*>|<[^>]*>', re.DOTALL | re.IGNORECASE)
+
+# 职位页面最大读取字节数，职位信息通常位于页面前部
+_MAX_RESPONSE_BYTES = 2 * 1024 * 1024
+
+class JobAnalysisError(Exception):
+    """职位分析失败"""
+
+class JobFetchError(JobAnalysisError):
+    """职位页面抓取失败（网络错误或HTTP错误状态）"""
+
+class JobParseError(JobAnalysisError):
+    """职位页面解析失败"""
+
+def _load_http_modules():
+    """延迟加载网络请求与HTML解析模块"""
+    global _requests, _BeautifulSoup, _HTML_PARSER
+    if _requests is None:
+        import requests
+        from bs4 import BeautifulSoup
+        try:
+            import lxml  # noqa: F401
+            _HTML_PARSER = 'lxml'
+        except ImportError:
+            _HTML_PARSER = 'html.parser'
+        _requests = requests
+        _BeautifulSoup = BeautifulSoup
+    return _requests, _BeautifulSoup
+
 class JobAnalyzer:
     def __init__(self):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
+        # 复用的HTTP会话（保持长连接），首次请求时创建
+        self._session = None
+        
+        # URL -> (过期时间, 职位信息)，按最近使用顺序淘汰
+        self._job_cache: 'OrderedDict[str, Tuple[float, Dict]]' = OrderedDict()
+        self._job_cache_lock = threading.Lock()
         
         # 定义不同网站的选择器规则
         self.site_selectors = {
@@ -43,6 +133,36 @@ class JobAnalyzer:
             }
         }
     
+    def _get_session(self):
+        """
+        获取复用的HTTP会话，启用连接池和失败重试
+        
+        Returns:
+            requests.Session对象
+        """
+        if self._session is None:
+            requests, _ = _load_http_modules()
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            
+            session = requests.Session()
+            session.headers.update(self.headers)
+            adapter = HTTPAdapter(
+                pool_connections=10,
+                pool_maxsize=20,
+                # 仅对GET请求的连接错误、超时及临时性状态码进行退避重试
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=0.3,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                    allowed_methods=['GET']
+                )
+            )
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            self._session = session
+        return self._session
+    
     def analyze_job_posting(self, url: str) -> Dict:
         """
         分析职位描述页面，提取关键信息
@@ -53,11 +173,91 @@ class JobAnalyzer:
         Returns:
             包含职位信息的字典
         """
-        try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+        cached = self._get_cached_job(url)
+        if cached is not None:
+            return cached
+        
+        job_info = self._fetch_job_posting(url)
+        self._cache_job(url, job_info)
+        return copy.deepcopy(job_info)
+    
+    def _get_cached_job(self, url: str) -> Optional[Dict]:
+        """
+        读取未过期的职位分析缓存
+        
+        Args:
+            url: 职位页面URL
+            
+        Returns:
+            缓存的职位信息副本，未命中或已过期时返回None
+        """
+        with self._job_cache_lock:
+            entry = self._job_cache.get(url)
+            if entry is None:
+                return None
+            expires_at, job_info = entry
+            if expires_at < time.monotonic():
+                del self._job_cache[url]
+                return None
+            self._job_cache.move_to_end(url)
+        # 职位信息包含列表，返回深拷贝，避免调用方修改到缓存中的数据
+        return copy.deepcopy(job_info)
+    
+    def _cache_job(self, url: str, job_info: Dict):
+        """
+        写入职位分析缓存，超出容量时淘汰最久未使用的条目
+        
+        Args:
+            url: 职位页面URL
+            job_info: 职位信息
+        """
+        with self._job_cache_lock:
+            self._job_cache[url] = (time.monotonic() + _JOB_CACHE_TTL, job_info)
+            self._job_cache.move_to_end(url)
+            while len(self._job_cache) > _JOB_CACHE_MAXSIZE:
+                self._job_cache.popitem(last=False)
+    
+    def _download(self, url: str) -> bytes:
+        """
+        流式下载职位页面，超过大小上限的部分直接丢弃
+        
+        Args:
+            url: 职位页面URL
+            
+        Returns:
+            页面内容（最多_MAX_RESPONSE_BYTES字节）
+        """
+        chunks = []
+        received = 0
+        with self._get_session().get(url, timeout=10, stream=True) as response:
             response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                chunks.append(chunk)
+                received += len(chunk)
+                if received >= _MAX_RESPONSE_BYTES:
+                    break
+        return b''.join(chunks)[:_MAX_RESPONSE_BYTES]
+    
+    def _fetch_job_posting(self, url: str) -> Dict:
+        """
+        抓取并解析职位页面
+        
+        Args:
+            url: 职位页面URL
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+        Returns:
+            包含职位信息的字典
+        """
+        requests, BeautifulSoup = _load_http_modules()
+        
+        # 网络错误由会话的重试策略处理，重试用尽后不再对解析阶段重复工作
+        try:
+            content = self._download(url)
+        except requests.RequestException as e:
+            raise JobFetchError(f"职位分析失败: {str(e)}") from e
+        
+        try:
+            soup = BeautifulSoup(content, _HTML_PARSER)
             
             # 根据URL识别网站类型
             site_type = self._identify_site(url)
@@ -71,12 +271,14 @@ class JobAnalyzer:
                 "description": self._extract_by_selectors(soup, selectors.get('description', '')),
                 "location": self._extract_by_selectors(soup, selectors.get('location', '')),
                 "requirements": self._extract_requirements(soup),
-                "key_skills": self._extract_key_skills(soup)
+                "key_skills": self._extract_key_skills(
+                    soup, content.decode(soup.original_encoding or 'utf-8', errors='replace')
+                )
             }
-            
-            return job_info
         except Exception as e:
-            raise Exception(f"职位分析失败: {str(e)}")
+            raise JobParseError(f"职位分析失败: {str(e)}") from e
+        
+        return job_info
     
     def _identify_site(self, url: str) -> str:
         """
@@ -100,7 +302,7 @@ class JobAnalyzer:
         else:
             return 'default'
     
-    def _extract_by_selectors(self, soup: BeautifulSoup, selectors_str: str) -> str:
+    def _extract_by_selectors(self, soup: 'BeautifulSoup', selectors_str: str) -> str:
         """
         根据选择器字符串提取内容
         
@@ -137,60 +339,62 @@ class JobAnalyzer:
         
         return ""
     
-    def _extract_job_title(self, soup: BeautifulSoup) -> str:
+    def _extract_job_title(self, soup: 'BeautifulSoup') -> str:
         """
         提取职位标题
         """
         # 使用通用方法
         return self._extract_by_selectors(soup, 'h1, [class*="title"], [data-testid="job-title"], title')
 
-    def _extract_company_name(self, soup: BeautifulSoup) -> str:
+    def _extract_company_name(self, soup: 'BeautifulSoup') -> str:
         """
         提取公司名称
         """
         # 使用通用方法
         return self._extract_by_selectors(soup, '[class*="company"], [data-testid="company-name"], [class*="employer"]')
     
-    def _extract_job_description(self, soup: BeautifulSoup) -> str:
+    def _extract_job_description(self, soup: 'BeautifulSoup') -> str:
         """
         提取职位描述
         """
         # 使用通用方法
         return self._extract_by_selectors(soup, '[class*="description"], [data-testid="job-description"], [class*="job-desc"]')
     
-    def _extract_requirements(self, soup: BeautifulSoup) -> List[str]:
+    def _extract_requirements(self, soup: 'BeautifulSoup') -> List[str]:
         """
         提取职位要求
         """
-        # 查找包含"要求"、"需求"、"requirement"等关键词的元素
-        requirement_keywords = ['要求', '需求', 'requirement', 'qualification', '资格', 'responsibilit', '职责']
+        # 一次遍历找出所有包含"要求"、"需求"、"requirement"等关键词的文本节点
+        elements = soup.find_all(string=_REQ_KW_RE)
         requirements = []
         
-        for keyword in requirement_keywords:
-            elements = soup.find_all(string=re.compile(keyword, re.IGNORECASE))
-            for element in elements:
-                parent = element.parent
-                # 查找列表项或段落
-                siblings = parent.find_next_siblings()
-                for sibling in siblings:
-                    if sibling.name in ['li', 'p', 'div']:
-                        text = sibling.get_text().strip()
-                        if text and len(text) > 5:  # 过滤太短的内容
-                            requirements.append(text)
-                            break  # 找到一个就够了，避免重复
-                
-                # 如果在siblings中没找到，尝试在parent的子元素中查找
-                if not requirements:
-                    children = parent.find_all(['li', 'p', 'div'])
-                    for child in children:
-                        text = child.get_text().strip()
-                        if text and len(text) > 5:
-                            requirements.append(text)
-                            break
+        # 同一父元素只处理一次
+        seen_parents = set()
+        for element in elements:
+            parent = element.parent
+            if id(parent) in seen_parents:
+                continue
+            seen_parents.add(id(parent))
+            
+            # 查找列表项或段落
+            for sibling in parent.next_siblings:
+                if getattr(sibling, 'name', None) in _REQ_TAGS:
+                    text = sibling.get_text().strip()
+                    if text and len(text) > 5:  # 过滤太短的内容
+                        requirements.append(text)
+                        break  # 找到一个就够了，避免重复
+            
+            # 如果在siblings中没找到，尝试在parent的子元素中查找
+            if not requirements:
+                for child in parent.find_all(_REQ_TAGS):
+                    text = child.get_text().strip()
+                    if text and len(text) > 5:
+                        requirements.append(text)
+                        break
         
         # 如果通过关键词没找到，尝试查找包含"要求"的section
         if not requirements:
-            requirement_sections = soup.find_all(string=re.compile(r'(要求|requirement|资格)', re.IGNORECASE))
+            requirement_sections = [element for element in elements if _REQ_SECTION_RE.search(element)]
             for section in requirement_sections:
                 parent = section.parent
                 # 查找兄弟元素中的列表
@@ -209,32 +413,28 @@ class JobAnalyzer:
         
         return requirements if requirements else ["未明确列出具体要求"]
     
-    def _extract_key_skills(self, soup: BeautifulSoup) -> List[str]:
+    def _extract_key_skills(self, soup: 'BeautifulSoup', html: Optional[str] = None) -> List[str]:
         """
         提取关键技能
+        
+        Args:
+            soup: BeautifulSoup对象
+            html: 原始HTML文本（可选），提供时直接去标签后匹配，省去遍历DOM拼接文本
         """
-        # 常见技能关键词
-        tech_skills = [
-            'Python', 'Java', 'JavaScript', 'React', 'Vue', 'Angular',
-            'Node.js', 'Express', 'Django', 'Flask', 'Spring',
-            'SQL', 'MongoDB', 'PostgreSQL', 'MySQL',
-            'AWS', 'Docker', 'Kubernetes', 'Git',
-            'Machine Learning', 'AI', '数据分析', '云计算',
-            'TensorFlow', 'PyTorch', 'Hadoop', 'Spark',
-            'Linux', 'Windows', 'macOS', 'CI/CD',
-            'DevOps', 'Agile', 'Scrum', 'JIRA'
-        ]
-        
-        job_text = soup.get_text()
-        found_skills = []
-        
-        for skill in tech_skills:
-            # 使用正则表达式进行更灵活的匹配
-            pattern = r'\b' + re.escape(skill) + r'\b'
-            if re.search(pattern, job_text, re.IGNORECASE):
-                found_skills.append(skill)
-        
-        return found_skills
+        if html is not None:
+            job_text = _TAG_STRIP_RE.sub(' ', html)
+        else:
+            job_text = soup.get_text()
+        
+        # 一次分词，与单词技能集合求交集
+        matched = {token.lower() for token in _WORD_RE.findall(job_text)} & _WORD_SKILLS
+        if _SHORT_WORD_SKILL_RE is not None:
+            matched.update(skill.lower() for skill in _SHORT_WORD_SKILL_RE.findall(job_text))
+        if _COMPOUND_SKILL_RE is not None:
+            matched.update(_COMPOUND_SKILL_RE.findall(job_text.lower()))
+        
+        # 按技能列表的顺序返回结果
+        return [skill for skill in _TECH_SKILLS if skill.lower() in matched]
 
 # 使用示例
 if __name__ == "__main__":
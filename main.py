@@ -3,45 +3,86 @@
 提供一键生成匹配简历、智能匹配、ATS优化等功能
 """
 
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
-from fastapi.responses import FileResponse, JSONResponse, HTMLResponse
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request, BackgroundTasks, Depends
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple
+import aiofiles
+import asyncio
+import contextlib
+import functools
+import gzip
+import hashlib
 import uvicorn
 import os
-import json
-from datetime import datetime
+import orjson
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.parse import quote
+from config import Config
+from models import UserProfile, UserResumeManager
+
+# 上传文件分块写入磁盘的块大小
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+# 允许上传的简历文件类型（与 ResumeParser 支持的类型一致）
+ALLOWED_UPLOAD_TYPES = frozenset({"pdf", "docx", "txt"})
+
+# 确保上传目录存在（只在启动时创建一次）
+os.makedirs(Config.UPLOAD_DIR, exist_ok=True)
+
+# 简历生成专用线程池大小，限制为CPU核数，避免与模型客户端自身的线程争抢；
+# 生成耗时较长，单独使用有界线程池，默认线程池留给用户信息、历史记录读取等短小的 I/O 调用
+GENERATE_MAX_WORKERS = os.cpu_count() or 4
+GENERATE_EXECUTOR = ThreadPoolExecutor(max_workers=GENERATE_MAX_WORKERS, thread_name_prefix="generate")
 
 app = FastAPI(
     title="简历助手",
     description="一款智能简历优化工具，可根据目标职位自动优化简历内容，提高通过ATS筛选系统的概率",
-    version="1.0.0"
+    version="1.0.0",
+    # 使用 orjson 序列化所有 JSON 响应
+    default_response_class=ORJSONResponse
 )
 
-# 添加CORS中间件以允许前端访问
+# 添加CORS中间件以允许前端访问，允许的域名见 Config.CORS_ORIGINS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # 在生产环境中应该指定具体的域名
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=Config.CORS_ORIGINS,
+    allow_credentials=False,  # 前端未使用 Cookie
+    allow_methods=["GET", "POST", "PUT"],
+    allow_headers=["Content-Type", "Authorization"],
 )
 
+class PrecompressedAwareGZipMiddleware(GZipMiddleware):
+    """跳过已预先压缩的路径，避免重复压缩"""
+    
+    # 自行返回 gzip 内容的路径
+    PRECOMPRESSED_PATHS = frozenset({"/"})
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in self.PRECOMPRESSED_PATHS:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+# 压缩较大的响应（历史记录、静态资源等）
+app.add_middleware(PrecompressedAwareGZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # 挂载静态文件目录
 if os.path.exists("frontend"):
     app.mount("/static", StaticFiles(directory="frontend"), name="static")
 
-@app.get("/", response_class=HTMLResponse)
-async def read_root():
-    """根路径，返回前端主页面"""
-    # 默认重定向到用户信息维护页面，让前端JavaScript处理用户状态检查
-    if os.path.exists("frontend/user-profile.html"):
-        with open("frontend/user-profile.html", "r", encoding="utf-8") as f:
-            return f.read()
-    else:
-        return """
+INDEX_HTML_PATH = "frontend/user-profile.html"
+
+# 前端主页面的浏览器缓存时间（秒），配合 ETag 实现 304 协商缓存
+INDEX_CACHE_MAX_AGE = 60
+
+# 前端文件缺失时返回的页面（启动时编码为字节，见下方 INDEX_FALLBACK_BODY）
+INDEX_FALLBACK_HTML = """
         <html>
             <head>
                 <title>简历助手</title>
@@ -54,86 +95,148 @@ async def read_root():
             </body>
         </html>
         """
+INDEX_FALLBACK_BODY = INDEX_FALLBACK_HTML.encode("utf-8")
+
+# 启动时读入内存的前端主页面、其 gzip 压缩版本及 ETag
+_index_html: Optional[bytes] = None
+_index_html_gz: Optional[bytes] = None
+_index_etag: Optional[str] = None
+
+@app.on_event("startup")
+async def load_index_html():
+    """启动时读取前端主页面并预先压缩，避免每次请求读取磁盘"""
+    global _index_html, _index_html_gz, _index_etag
+    try:
+        with open(INDEX_HTML_PATH, "rb") as f:
+            _index_html = f.read()
+        _index_html_gz = gzip.compress(_index_html, compresslevel=6)
+        _index_etag = f'"{hashlib.md5(_index_html).hexdigest()}"'
+    except FileNotFoundError:
+        _index_html = _index_html_gz = _index_etag = None
+
+@app.get("/", response_class=HTMLResponse)
+async def read_root(request: Request):
+    """根路径，返回前端主页面"""
+    # 默认重定向到用户信息维护页面，让前端JavaScript处理用户状态检查
+    if _index_html is None:
+        return Response(content=INDEX_FALLBACK_BODY, media_type="text/html; charset=utf-8")
+    
+    headers = {
+        "Vary": "Accept-Encoding",
+        "ETag": _index_etag,
+        "Cache-Control": f"public, max-age={INDEX_CACHE_MAX_AGE}",
+    }
+    # 浏览器缓存仍然有效时不重复发送页面内容
+    if request.headers.get("if-none-match") == _index_etag:
+        return Response(status_code=304, headers=headers)
+    
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=_index_html_gz, media_type="text/html; charset=utf-8", headers=headers)
+    return Response(content=_index_html, media_type="text/html; charset=utf-8", headers=headers)
 
-# 尝试导入用户交互模块，如果失败则使用内置的简化版本
-try:
-    from user_interface import UserInterface
-    ui = UserInterface()
-    MODULES_AVAILABLE = True
-    print("✅ 用户交互模块加载成功")
-except ImportError as e:
-    print(f"❌ 无法导入用户交互模块: {e}")
-    ui = None
-    MODULES_AVAILABLE = False
-except Exception as e:
-    print(f"❌ 用户交互模块初始化失败: {e}")
-    ui = None
-    MODULES_AVAILABLE = False
+# 用户交互模块及用户简历管理器在启动时加载，见 load_modules()
+ui = None
+user_manager = None
+MODULES_AVAILABLE = False
+
+# 演示模式下各生成方式返回的匹配度和建议: 生成方式 -> (匹配度, 优化建议, ATS建议)
+DEMO_RESULTS = {
+    "description": (0.85, [
+        "增加Python相关项目经验",
+        "突出FastAPI开发经验",
+        "添加机器学习相关技能"
+    ], [
+        "优化关键词密度",
+        "调整简历结构以适应ATS系统",
+        "添加标准技能术语"
+    ]),
+    "url": (0.88, [
+        "增加Web开发相关经验",
+        "突出RESTful API设计能力",
+        "添加Docker部署经验"
+    ], [
+        "确保使用标准职位关键词",
+        "优化简历格式以适应ATS解析",
+        "强调量化的工作成果"
+    ]),
+    "template": (0.90, [
+        "增加项目管理经验",
+        "突出团队协作能力",
+        "添加敏捷开发经验"
+    ], [
+        "确保简历结构清晰",
+        "使用标准的简历部分标题",
+        "优化关键词匹配度"
+    ]),
+}
 
 # 如果模块加载失败，使用简化的内置版本
 class SimpleUserInterface:
     """简化的用户交互接口，用于演示"""
     
-    def generate_resume_by_description(self, description, resume_path, file_type='pdf'):
+    @staticmethod
+    def _demo_result(kind: str) -> dict:
+        """根据生成方式构造演示结果"""
+        match_score, suggestions, ats_suggestions = DEMO_RESULTS[kind]
         return {
             "success": True,
             "message": "简历生成成功（演示模式）",
-            "match_score": 0.85,
-            "suggestions": [
-                "增加Python相关项目经验",
-                "突出FastAPI开发经验", 
-                "添加机器学习相关技能"
-            ],
-            "ats_suggestions": [
-                "优化关键词密度",
-                "调整简历结构以适应ATS系统",
-                "添加标准技能术语"
-            ],
+            "match_score": match_score,
+            "suggestions": list(suggestions),
+            "ats_suggestions": list(ats_suggestions),
             "generated_file": "demo_resume.pdf"
         }
     
-    def generate_resume_by_url(self, url, resume_path, file_type='pdf'):
-        return {
-            "success": True,
-            "message": "简历生成成功（演示模式）",
-            "match_score": 0.88,
-            "suggestions": [
-                "增加Web开发相关经验",
-                "突出RESTful API设计能力",
-                "添加Docker部署经验"
-            ],
-            "ats_suggestions": [
-                "确保使用标准职位关键词",
-                "优化简历格式以适应ATS解析",
-                "强调量化的工作成果"
-            ],
-            "generated_file": "demo_resume.pdf"
-        }
+    def generate_resume_by_description(self, description, resume_path, file_type='pdf', user_id=None):
+        return self._demo_result("description")
     
-    def generate_resume_by_template(self, template_name, resume_path, file_type='pdf'):
-        return {
-            "success": True,
-            "message": "简历生成成功（演示模式）",
-            "match_score": 0.90,
-            "suggestions": [
-                "增加项目管理经验",
-                "突出团队协作能力",
-                "添加敏捷开发经验"
-            ],
-            "ats_suggestions": [
-                "确保简历结构清晰",
-                "使用标准的简历部分标题",
-                "优化关键词匹配度"
-            ],
-            "generated_file": "demo_resume.pdf"
-        }
+    def generate_resume_by_url(self, url, resume_path, file_type='pdf', user_id=None):
+        return self._demo_result("url")
+    
+    def generate_resume_by_template(self, template_name, resume_path, file_type='pdf', user_id=None):
+        return self._demo_result("template")
+
+@app.on_event("startup")
+async def load_modules():
+    """
+    启动时加载用户交互模块（依赖较重），避免在导入 main 时加载，
+    如果失败则使用内置的简化版本
+    """
+    global ui, user_manager, MODULES_AVAILABLE
+    
+    # 初始化用户简历管理器
+    user_manager = UserResumeManager()
+    
+    # 尝试导入用户交互模块
+    try:
+        from user_interface import UserInterface
+        ui = UserInterface(user_manager=user_manager)
+        MODULES_AVAILABLE = True
+        print("✅ 用户交互模块加载成功")
+    except ImportError as e:
+        print(f"❌ 无法导入用户交互模块: {e}")
+        MODULES_AVAILABLE = False
+    except Exception as e:
+        print(f"❌ 用户交互模块初始化失败: {e}")
+        MODULES_AVAILABLE = False
+    
+    if not MODULES_AVAILABLE:
+        ui = SimpleUserInterface()
 
-if not MODULES_AVAILABLE:
-    ui = SimpleUserInterface()
+@app.on_event("shutdown")
+async def shutdown_modules():
+    """关闭简历生成线程池及用户交互模块持有的进程池"""
+    GENERATE_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+    shutdown = getattr(ui, "shutdown", None)
+    if shutdown is not None:
+        await asyncio.to_thread(shutdown)
 
-def check_modules_available():
+async def check_modules_available():
     """
     检查模块是否可用，如果不可用则抛出异常
+    作为路由依赖使用: dependencies=[Depends(check_modules_available)]
+    （定义为 async 函数，FastAPI 会直接在事件循环中调用，不经过线程池）
     """
     if not MODULES_AVAILABLE:
         raise HTTPException(
@@ -141,6 +244,74 @@ def check_modules_available():
             detail="服务暂时不可用：核心模块未正确加载，请检查依赖项安装"
         )
 
+def _ext(name: str, default: str = "pdf") -> str:
+    """取文件扩展名（小写，不含点），没有扩展名时返回默认值"""
+    return (os.path.splitext(name)[1][1:] or default).lower()
+
+async def _save_upload(resume: UploadFile, content_addressed: bool = False) -> Tuple[str, str]:
+    """
+    将上传的简历分块流式写入上传目录，避免整个文件读入内存
+    
+    Args:
+        resume: 上传的简历文件
+        content_addressed: 是否按内容哈希命名（相同内容的简历只保存一份），
+            仅用于长期保存的文件；用后即删的临时文件不能共用路径
+        
+    Returns:
+        (保存的文件路径, 文件类型)
+    """
+    file_type = _ext(resume.filename)
+    if file_type not in ALLOWED_UPLOAD_TYPES:
+        raise HTTPException(status_code=400, detail=f"不支持的文件类型: {file_type}")
+    
+    fd, resume_path = await asyncio.to_thread(
+        tempfile.mkstemp, prefix="uploaded_resume_", suffix=f".{file_type}", dir=Config.UPLOAD_DIR
+    )
+    digest = hashlib.blake2b(digest_size=16) if content_addressed else None
+    
+    try:
+        # 直接复用 mkstemp 打开的文件描述符，不再重新打开文件
+        async with aiofiles.open(fd, "wb") as buffer:
+            while chunk := await resume.read(UPLOAD_CHUNK_SIZE):
+                if digest is not None:
+                    digest.update(chunk)
+                await buffer.write(chunk)
+    except Exception:
+        await asyncio.to_thread(_remove_upload, resume_path)
+        raise
+    finally:
+        # 尽早释放上传内容占用的临时缓冲
+        await resume.close()
+    
+    if digest is not None:
+        stored_path = os.path.join(Config.UPLOAD_DIR, f"uploaded_resume_{digest.hexdigest()}.{file_type}")
+        await asyncio.to_thread(_store_upload, resume_path, stored_path)
+        resume_path = stored_path
+    
+    return resume_path, file_type
+
+def _store_upload(tmp_path: str, stored_path: str):
+    """
+    将写入完成的上传文件移动到按内容哈希命名的路径，相同内容已保存过时丢弃本次写入的副本
+    
+    Args:
+        tmp_path: 上传内容写入的临时文件路径
+        stored_path: 按内容哈希命名的保存路径
+    """
+    try:
+        if os.path.exists(stored_path):
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, stored_path)
+    except Exception:
+        _remove_upload(tmp_path)
+        raise
+
+def _remove_upload(resume_path: str):
+    """删除上传的临时简历文件，文件已不存在时忽略"""
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(resume_path)
+
 class JobDescriptionRequest(BaseModel):
     description: str
 
@@ -166,49 +337,71 @@ async def api_info():
         "modules_available": MODULES_AVAILABLE
     }
 
-@app.post("/generate-by-description")
-async def generate_by_description(
-    description: str = Form(...), 
-    resume: UploadFile = File(None),
-    user_id: str = Form(None)
-):
-    """
-    根据职位描述生成简历
+async def _generate(kind: str, value: str, resume: Optional[UploadFile], user_id: Optional[str],
+                    background_tasks: BackgroundTasks) -> ORJSONResponse:
     """
-    check_modules_available()
+    三个生成接口的公共处理流程：保存上传简历、调用生成方法、添加时间戳并清理文件
     
+    Args:
+        kind: 生成方式（description/url/template）
+        value: 职位描述、职位链接或模板名称
+        resume: 上传的简历文件
+        user_id: 用户ID
+        background_tasks: 响应发送后执行的后台任务
+        
+    Returns:
+        生成结果响应
+    """
+    resume_path = None
     try:
-        resume_path = None
         file_type = 'pdf'
         
         # 如果有上传简历文件，则保存
         if resume and resume.filename:
-            resume_path = f"uploaded_resume_{int(datetime.now().timestamp())}_{resume.filename}"
-            with open(resume_path, "wb") as buffer:
-                buffer.write(await resume.read())
-            file_type = resume.filename.split('.')[-1] if '.' in resume.filename else 'pdf'
+            resume_path, file_type = await _save_upload(resume)
         
-        # 生成简历
-        result = ui.generate_resume_by_description(
-            description, 
+        # 生成简历（在专用线程池中执行，避免阻塞事件循环）
+        result = await asyncio.get_running_loop().run_in_executor(
+            GENERATE_EXECUTOR,
+            getattr(ui, f"generate_resume_by_{kind}"),
+            value, 
             resume_path, 
             file_type,
             user_id
         )
         
         # 添加时间戳
-        result["timestamp"] = datetime.now().isoformat()
+        result["timestamp"] = datetime.now(timezone.utc).isoformat()
         
-        # 清理上传的文件
-        if resume_path and os.path.exists(resume_path):
-            os.remove(resume_path)
+        # 响应发送后再清理上传的文件
+        if resume_path:
+            background_tasks.add_task(_remove_upload, resume_path)
         
-        return result
+        # 结果只包含基本类型，直接用 orjson 序列化，跳过 jsonable_encoder 的逐字段转换
+        return ORJSONResponse(result)
+    except HTTPException:
+        raise
     except Exception as e:
+        # 出错时不会执行后台任务，直接清理
+        if resume_path:
+            await asyncio.to_thread(_remove_upload, resume_path)
         raise HTTPException(status_code=500, detail=f"处理失败: {str(e)}")
 
-@app.post("/generate-by-url")
+@app.post("/generate-by-description", dependencies=[Depends(check_modules_available)])
+async def generate_by_description(
+    background_tasks: BackgroundTasks,
+    description: str = Form(...), 
+    resume: UploadFile = File(None),
+    user_id: str = Form(None)
+):
+    """
+    根据职位描述生成简历
+    """
+    return await _generate("description", description, resume, user_id, background_tasks)
+
+@app.post("/generate-by-url", dependencies=[Depends(check_modules_available)])
 async def generate_by_url(
+    background_tasks: BackgroundTasks,
     url: str = Form(...), 
     resume: UploadFile = File(None),
     user_id: str = Form(None)
@@ -216,40 +409,11 @@ async def generate_by_url(
     """
     根据职位链接生成简历
     """
-    check_modules_available()
-    
-    try:
-        resume_path = None
-        file_type = 'pdf'
-        
-        # 如果有上传简历文件，则保存
-        if resume and resume.filename:
-            resume_path = f"uploaded_resume_{int(datetime.now().timestamp())}_{resume.filename}"
-            with open(resume_path, "wb") as buffer:
-                buffer.write(await resume.read())
-            file_type = resume.filename.split('.')[-1] if '.' in resume.filename else 'pdf'
-        
-        # 生成简历
-        result = ui.generate_resume_by_url(
-            url, 
-            resume_path, 
-            file_type,
-            user_id
-        )
-        
-        # 添加时间戳
-        result["timestamp"] = datetime.now().isoformat()
-        
-        # 清理上传的文件
-        if resume_path and os.path.exists(resume_path):
-            os.remove(resume_path)
-        
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"处理失败: {str(e)}")
+    return await _generate("url", url, resume, user_id, background_tasks)
 
-@app.post("/generate-by-template")
+@app.post("/generate-by-template", dependencies=[Depends(check_modules_available)])
 async def generate_by_template(
+    background_tasks: BackgroundTasks,
     template_name: str = Form(...), 
     resume: UploadFile = File(None),
     user_id: str = Form(None)
@@ -257,97 +421,119 @@ async def generate_by_template(
     """
     根据模板生成简历
     """
-    check_modules_available()
-    
-    try:
-        resume_path = None
-        file_type = 'pdf'
-        
-        # 如果有上传简历文件，则保存
-        if resume and resume.filename:
-            resume_path = f"uploaded_resume_{int(datetime.now().timestamp())}_{resume.filename}"
-            with open(resume_path, "wb") as buffer:
-                buffer.write(await resume.read())
-            file_type = resume.filename.split('.')[-1] if '.' in resume.filename else 'pdf'
-        
-        # 生成简历
-        result = ui.generate_resume_by_template(
-            template_name, 
-            resume_path, 
-            file_type,
-            user_id
-        )
-        
-        # 添加时间戳
-        result["timestamp"] = datetime.now().isoformat()
-        
-        # 清理上传的文件
-        if resume_path and os.path.exists(resume_path):
-            os.remove(resume_path)
-        
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"处理失败: {str(e)}")
+    return await _generate("template", template_name, resume, user_id, background_tasks)
 
-@app.post("/upload-resume")
+@app.post("/upload-resume", dependencies=[Depends(check_modules_available)])
 async def upload_resume(resume: UploadFile = File(...)):
     """
     上传简历文件
     """
-    check_modules_available()
-    
     try:
-        # 生成唯一的文件名
-        import uuid
-        file_extension = resume.filename.split('.')[-1] if '.' in resume.filename else 'pdf'
-        unique_filename = f"uploaded_resume_{uuid.uuid4().hex}.{file_extension}"
-        
-        # 保存文件
-        with open(unique_filename, "wb") as buffer:
-            buffer.write(await resume.read())
+        # 保存文件（按内容哈希命名，重复上传的相同简历只保存一份）
+        resume_path, _ = await _save_upload(resume, content_addressed=True)
         
         # 保存文件信息到会话（简化处理，实际应用中应使用数据库）
         return {
             "success": True,
             "message": "简历上传成功",
-            "filename": unique_filename,
+            "filename": os.path.basename(resume_path),
             "original_name": resume.filename
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"上传失败: {str(e)}")
 
+TEMPLATES_DIR = "templates"
+DEFAULT_TEMPLATES = ("software_engineer", "data_analyst")
+DEFAULT_TEMPLATES_BODY = orjson.dumps({"templates": DEFAULT_TEMPLATES})
+
+@functools.lru_cache(maxsize=4)
+def _templates_for(mtime_ns: int) -> bytes:
+    """
+    列出模板目录中的模板名称并序列化为响应体，按目录修改时间缓存
+    
+    Args:
+        mtime_ns: 模板目录的修改时间，目录变化时缓存自动失效
+        
+    Returns:
+        序列化后的模板列表响应体
+    """
+    templates = [f[:-len('.json')] for f in os.listdir(TEMPLATES_DIR) if f.endswith('.json')]
+    return orjson.dumps({"templates": templates})
+
 @app.get("/templates")
-async def get_templates():
-    """获取可用模板列表"""
+def get_templates():
+    """获取可用模板列表（同步处理函数，文件系统调用在线程池中执行）"""
     try:
-        templates_dir = "templates"
-        if os.path.exists(templates_dir):
-            template_files = [f.replace('.json', '') for f in os.listdir(templates_dir) if f.endswith('.json')]
-            return {"templates": template_files}
-        else:
-            return {"templates": ["software_engineer", "data_analyst"]}
-    except Exception as e:
-        return {"templates": ["software_engineer", "data_analyst"]}
+        mtime_ns = os.stat(TEMPLATES_DIR).st_mtime_ns
+        return Response(content=_templates_for(mtime_ns), media_type="application/json")
+    except OSError:
+        return Response(content=DEFAULT_TEMPLATES_BODY, media_type="application/json")
+
+HISTORY_FILE = "generation_history.json"
+EMPTY_HISTORY_BODY = b'{"history":[]}'
+
+# 历史记录响应缓存: (st_mtime_ns, st_size, 序列化后的响应体)
+_history_cache: Optional[Tuple[int, int, bytes]] = None
+
+def _normalize_history_file():
+    """将旧格式（{"history": [...]}）的历史记录文件改写为数组，之后读取时无需解析"""
+    try:
+        with open(HISTORY_FILE, 'rb') as f:
+            history_data = orjson.loads(f.read())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return
+    if isinstance(history_data, list):
+        return
+    # 旧格式取出其中的记录，其他无效内容（null、字符串等）视为空历史记录
+    history = history_data.get("history", []) if isinstance(history_data, dict) else []
+    
+    # 所有工作进程启动时都会执行迁移：先写临时文件再原子替换，读取方不会看到写了一半的文件
+    tmp_path = f"{HISTORY_FILE}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(history, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_path, HISTORY_FILE)
+
+@app.on_event("startup")
+async def migrate_history_file():
+    """启动时统一历史记录文件格式"""
+    await asyncio.to_thread(_normalize_history_file)
+
+def _load_history_body() -> bytes:
+    """
+    获取历史记录响应体：文件未变化时返回缓存，否则读取文件（JSON数组）
+    并直接包装为响应体，不重新序列化；文件变化时校验一次，内容无效时返回空历史记录
+    """
+    global _history_cache
+    st = os.stat(HISTORY_FILE)
+    key = (st.st_mtime_ns, st.st_size)
+    if _history_cache is None or _history_cache[:2] != key:
+        with open(HISTORY_FILE, 'rb') as f:
+            raw = f.read().strip()
+        try:
+            valid = isinstance(orjson.loads(raw or b'[]'), list)
+        except orjson.JSONDecodeError:
+            valid = False
+        body = b'{"history":' + (raw or b'[]') + b'}' if valid else EMPTY_HISTORY_BODY
+        _history_cache = (*key, body)
+    return _history_cache[2]
 
 @app.get("/history")
 async def get_history():
     """获取生成历史记录"""
     try:
-        history_file = "generation_history.json"
-        if os.path.exists(history_file):
-            with open(history_file, 'r', encoding='utf-8') as f:
-                history_data = json.load(f)
-            # 如果文件直接存储数组，则直接返回；如果是对象，则提取history字段
-            if isinstance(history_data, list):
-                return {"history": history_data}
-            else:
-                return {"history": history_data.get("history", [])}
-        else:
-            # 返回空历史记录
-            return {"history": []}
+        body = await asyncio.to_thread(_load_history_body)
+        return Response(content=body, media_type="application/json")
+    except FileNotFoundError:
+        # 返回空历史记录
+        return Response(content=EMPTY_HISTORY_BODY, media_type="application/json")
     except Exception as e:
         print(f"读取历史记录失败: {e}")
-        return {"history": []}
+        return Response(content=EMPTY_HISTORY_BODY, media_type="application/json")
+
+# 部署在 nginx 之后时由 nginx 通过 sendfile 直接发送文件，应用进程不再读写文件内容（见 Config.DOWNLOAD_ACCEL_REDIRECT）
+DOWNLOAD_ACCEL_REDIRECT = Config.DOWNLOAD_ACCEL_REDIRECT
 
 @app.get("/download/{filename}")
 async def download_file(filename: str):
@@ -360,54 +546,31 @@ async def download_file(filename: str):
     if filename.startswith("demo_"):
         raise HTTPException(status_code=404, detail="演示文件不可下载，请生成真实简历")
     
-    # 首先尝试原始文件名
-    file_path = filename
-    if os.path.exists(file_path):
-        return FileResponse(file_path)
-    
-    # 如果原始文件名不存在，尝试带重复扩展名的文件名（处理历史遗留问题）
+    # 依次尝试原始文件名和带重复扩展名的文件名（处理历史遗留问题），每个候选只 stat 一次
+    candidates = [filename]
     if filename.endswith('.pdf'):
-        duplicate_ext_path = filename + '.pdf'
+        candidates.append(filename + '.pdf')
     elif filename.endswith('.docx'):
-        duplicate_ext_path = filename + '.docx'
-    else:
-        duplicate_ext_path = None
+        candidates.append(filename + '.docx')
     
-    if duplicate_ext_path and os.path.exists(duplicate_ext_path):
-        return FileResponse(duplicate_ext_path)
+    for file_path in candidates:
+        try:
+            st = await asyncio.to_thread(os.stat, file_path)
+        except FileNotFoundError:
+            continue
+        if DOWNLOAD_ACCEL_REDIRECT:
+            return Response(headers={"X-Accel-Redirect": f"{DOWNLOAD_ACCEL_REDIRECT}/{quote(file_path)}"})
+        return FileResponse(file_path, stat_result=st)
     
     raise HTTPException(status_code=404, detail="文件未找到")
 
-def check_modules_available():
-    """检查模块是否可用"""
-    if not MODULES_AVAILABLE:
-        raise HTTPException(status_code=503, detail="核心模块未加载，请检查依赖项安装")
-
-# 导入模型类
-from models import (
-    UserProfile, 
-    ResumeContent, 
-    WorkExperience, 
-    Education, 
-    Skill, 
-    Certificate, 
-    Project, 
-    Language,
-    ResumeFile, 
-    ResumeFormats, 
-    UserResumeManager
-)
-
-# 初始化用户简历管理器
-user_manager = UserResumeManager()
-
 @app.post("/users")
 async def create_user(profile: UserProfile):
     """
     创建用户
     """
     try:
-        user = user_manager.create_user(profile)
+        user = await asyncio.to_thread(user_manager.create_user, profile)
         return {
             "success": True,
             "message": "用户创建成功",
@@ -423,7 +586,7 @@ async def get_user(user_id: str):
     """
     try:
         print(f"正在获取用户信息: {user_id}")
-        user = user_manager.get_user(user_id)
+        user = await asyncio.to_thread(user_manager.get_user, user_id)
         if user:
             print(f"用户信息获取成功: {user_id}")
             return {
@@ -449,7 +612,10 @@ async def update_user(user_id: str, profile: UserProfile):
     """
     try:
         profile.user_id = user_id
-        user = user_manager.update_user(profile)
+        
+        # 更新时间由 update_user 设置；在线程池中原子写入后再返回，既不阻塞事件循环，也保证返回成功时数据已落盘，
+        # 其他工作进程和后续的简历生成都能读到最新信息
+        user = await asyncio.to_thread(user_manager.update_user, profile)
         return {
             "success": True,
             "message": "用户信息更新成功",
@@ -478,10 +644,7 @@ if __name__ == "__main__":
     
     print()
     print("🔧 模块状态:")
-    if MODULES_AVAILABLE:
-        print("✅ 所有核心模块已加载")
-    else:
-        print("⚠️  核心模块未完全加载，将使用演示模式")
+    print("ℹ️  核心模块将在各工作进程启动时加载，加载失败时使用演示模式")
     
     print()
     print("🚀 启动服务器...")
@@ -489,5 +652,24 @@ if __name__ == "__main__":
     print("🛑 按 Ctrl+C 停止服务器")
     print()
     
-    # 启动服务器
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=False)
+    if Config.ENVIRONMENT == "development":
+        # 开发环境：单进程并在代码变化时自动重载
+        uvicorn.run("main:app", host=Config.HOST, port=Config.PORT, loop="uvloop", reload=True)
+    else:
+        # 启动服务器：使用 uvloop 事件循环和 httptools 解析器（需安装 uvicorn[standard]）
+        # 多个工作进程共享监听端口，进程数可通过环境变量 WORKERS 指定
+        # 生产环境也可使用: gunicorn main:app -k uvicorn.workers.UvicornWorker -w $WORKERS --preload
+        uvicorn.run(
+            "main:app",
+            host=Config.HOST,
+            port=Config.PORT,
+            workers=Config.WORKERS,
+            loop="uvloop",
+            http="httptools",
+            access_log=False,
+            # 超出并发上限的连接直接返回 503，避免在线程池前无限排队
+            limit_concurrency=200,
+            backlog=2048,
+            timeout_keep_alive=15,
+            reload=False
+        )
@@ -3,11 +3,56 @@
 遵循行业通用的简历设计标准
 """
 
-from typing import Dict, List, Optional, Union
-from pydantic import BaseModel, Field
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
-import json
+import orjson
 import os
+import sqlite3
+import sys
+import threading
+from uuid import uuid4
+
+# 模型缓存（用户、简历、简历文件信息）的最大条目数
+_MODEL_CACHE_MAXSIZE = 4096
+
+# 无法在内核中复制文件时，分块读写的块大小
+_COPY_CHUNK_SIZE = 1 << 20
+
+# 解析后的简历数据和简历多格式版本索引存放在单个 SQLite 数据库中，多个工作进程共享
+_DB_NAME = "resumes.db"
+_SQL_CREATE_PARSED = """
+    CREATE TABLE IF NOT EXISTS parsed_resumes (
+        file_id TEXT PRIMARY KEY,
+        data BLOB NOT NULL
+    )
+"""
+_SQL_UPSERT_PARSED = 'INSERT OR REPLACE INTO parsed_resumes (file_id, data) VALUES (?, ?)'
+_SQL_SELECT_PARSED = 'SELECT data FROM parsed_resumes WHERE file_id = ?'
+_SQL_CREATE_FORMATS_INDEX = """
+    CREATE TABLE IF NOT EXISTS resume_formats (
+        resume_id TEXT PRIMARY KEY,
+        formats_id TEXT NOT NULL
+    )
+"""
+_SQL_UPSERT_FORMATS_INDEX = 'INSERT OR REPLACE INTO resume_formats (resume_id, formats_id) VALUES (?, ?)'
+_SQL_IMPORT_FORMATS_INDEX = 'INSERT OR IGNORE INTO resume_formats (resume_id, formats_id) VALUES (?, ?)'
+_SQL_SELECT_FORMATS_INDEX = 'SELECT formats_id FROM resume_formats WHERE resume_id = ?'
+_SQL_HAS_FORMATS_INDEX = 'SELECT 1 FROM resume_formats LIMIT 1'
+
+def _dump_model(model: BaseModel) -> bytes:
+    """
+    将模型序列化为 JSON 字节串
+    
+    直接调用 pydantic-core 的序列化器输出 bytes，一次遍历整个模型（含嵌套的工作经历、项目等列表），
+    省去 model_dump_json() 生成 str 后再 encode 的额外拷贝
+    """
+    return model.__pydantic_serializer__.to_json(model)
+
+def _intern_str(value):
+    """驻留取值范围很小的字符串字段（性别、熟练程度、技能类别），大量简历共用同一个字符串对象"""
+    return sys.intern(value) if isinstance(value, str) else value
 
 class UserProfile(BaseModel):
     """用户基本信息模型 - 简历必需信息"""
@@ -21,6 +66,12 @@ class UserProfile(BaseModel):
     website: str = Field(default="", description="个人网站/LinkedIn")
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
+    
+    @field_validator('gender')
+    @classmethod
+    def intern_gender(cls, v):
+        """驻留性别字符串"""
+        return _intern_str(v)
 
 class WorkExperience(BaseModel):
     """工作经历模型"""
@@ -31,7 +82,7 @@ class WorkExperience(BaseModel):
     end_date: str = Field(default="至今", description="结束日期")
     is_current: bool = Field(default=False, description="是否为当前工作")
     description: str = Field(default="", description="工作描述")
-    achievements: List[str] = Field(default=[], description="主要成就")
+    achievements: List[str] = Field(default_factory=list, description="主要成就")
 
 class Education(BaseModel):
     """教育背景模型"""
@@ -50,6 +101,12 @@ class Skill(BaseModel):
     name: str = Field(description="技能名称")
     proficiency: str = Field(default="中级", description="熟练程度")
     category: str = Field(default="其他", description="技能类别")
+    
+    @field_validator('proficiency', 'category')
+    @classmethod
+    def intern_skill_levels(cls, v):
+        """驻留熟练程度和技能类别字符串"""
+        return _intern_str(v)
 
 class Certificate(BaseModel):
     """证书模型"""
@@ -68,9 +125,9 @@ class Project(BaseModel):
     start_date: str = Field(description="开始日期")
     end_date: str = Field(default="", description="结束日期")
     role: str = Field(default="", description="担任角色")
-    technologies: List[str] = Field(default=[], description="使用技术")
+    technologies: List[str] = Field(default_factory=list, description="使用技术")
     url: str = Field(default="", description="项目链接")
-    achievements: List[str] = Field(default=[], description="项目成果")
+    achievements: List[str] = Field(default_factory=list, description="项目成果")
 
 class Language(BaseModel):
     """语言能力模型"""
@@ -78,6 +135,12 @@ class Language(BaseModel):
     name: str = Field(description="语言名称")
     proficiency: str = Field(default="中级", description="熟练程度")
     certificate: str = Field(default="", description="相关证书")
+    
+    @field_validator('proficiency')
+    @classmethod
+    def intern_proficiency(cls, v):
+        """驻留熟练程度字符串"""
+        return _intern_str(v)
 
 class ResumeBaseInfo(BaseModel):
     """简历基本信息模型"""
@@ -92,19 +155,19 @@ class ResumeContent(BaseModel):
     """简历内容模型 - 遵循行业标准结构"""
     # 必需信息
     profile: UserProfile = Field(description="用户基本信息")
-    work_experience: List[WorkExperience] = Field(default=[], description="工作经历")
+    work_experience: List[WorkExperience] = Field(default_factory=list, description="工作经历")
     
     # 可选信息
-    education: List[Education] = Field(default=[], description="教育背景")
-    skills: List[Skill] = Field(default=[], description="技能")
-    certificates: List[Certificate] = Field(default=[], description="证书")
-    projects: List[Project] = Field(default=[], description="项目经历")
-    languages: List[Language] = Field(default=[], description="语言能力")
+    education: List[Education] = Field(default_factory=list, description="教育背景")
+    skills: List[Skill] = Field(default_factory=list, description="技能")
+    certificates: List[Certificate] = Field(default_factory=list, description="证书")
+    projects: List[Project] = Field(default_factory=list, description="项目经历")
+    languages: List[Language] = Field(default_factory=list, description="语言能力")
     
     # 其他可选信息
-    interests: List[str] = Field(default=[], description="兴趣爱好")
+    interests: List[str] = Field(default_factory=list, description="兴趣爱好")
     references: str = Field(default="", description="推荐人信息")
-    custom_sections: Dict[str, str] = Field(default={}, description="自定义部分")
+    custom_sections: Dict[str, str] = Field(default_factory=dict, description="自定义部分")
 
 class ResumeFile(BaseModel):
     """简历文件模型"""
@@ -129,6 +192,10 @@ class UserResumeManager:
     """用户简历管理器"""
     
     def __init__(self, data_dir: str = "user_data"):
+        """
+        Args:
+            data_dir: 数据目录
+        """
         self.data_dir = data_dir
         self.users_dir = os.path.join(data_dir, "users")
         self.resumes_dir = os.path.join(data_dir, "resumes")
@@ -138,20 +205,81 @@ class UserResumeManager:
         os.makedirs(self.users_dir, exist_ok=True)
         os.makedirs(self.resumes_dir, exist_ok=True)
         os.makedirs(self.files_dir, exist_ok=True)
+        
+        # 模型LRU缓存: 文件路径 -> (文件版本, 模型)，以 (修改时间, 大小, inode) 校验是否过期
+        self._model_cache: "OrderedDict[str, Tuple[Tuple[int, int, int], BaseModel]]" = OrderedDict()
+        self._model_cache_lock = threading.Lock()
+        
+        # 简历数据库：单文件 WAL 模式，按主键 B 树查找，读写互不阻塞，多个工作进程看到同一份数据
+        self._db_lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(data_dir, _DB_NAME), check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute(_SQL_CREATE_PARSED)
+        self._db.execute(_SQL_CREATE_FORMATS_INDEX)
+        self._db.commit()
+        
+        # 简历多格式版本索引: resume_id -> formats_id，避免查找时扫描整个目录
+        self._import_formats_index()
+    
+    def _import_formats_index(self):
+        """索引表为空时，从旧版本的索引文件或已有的格式文件导入简历多格式版本索引"""
+        with self._db_lock:
+            if self._db.execute(_SQL_HAS_FORMATS_INDEX).fetchone():
+                return
+        
+        legacy_index_path = os.path.join(self.files_dir, "_formats_index.json")
+        try:
+            with open(legacy_index_path, 'rb') as f:
+                index = orjson.loads(f.read())
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            index = {}
+            for filename in os.listdir(self.files_dir):
+                if filename.endswith('_formats.json'):
+                    with open(os.path.join(self.files_dir, filename), 'rb') as f:
+                        formats = ResumeFormats.model_validate_json(f.read())
+                    index[formats.resume_id] = formats.formats_id
+        
+        # 多个工作进程可能同时导入，已存在的条目保持不变
+        with self._db_lock, self._db:
+            self._db.executemany(_SQL_IMPORT_FORMATS_INDEX, index.items())
+    
+    def _atomic_write(self, path: str, data: bytes):
+        """
+        原子地写入文件：整块写入临时文件并 fsync 后再替换目标文件，崩溃时不会留下写了一半的记录
+        
+        Args:
+            path: 文件路径
+            data: 文件内容
+        """
+        # 临时文件名区分进程和线程，避免并发写入同一文件时互相覆盖
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            os.remove(tmp_path)
+            raise
     
     def create_user(self, profile: UserProfile) -> UserProfile:
         """创建用户"""
         if not profile.user_id:
-            import uuid
-            profile.user_id = str(uuid.uuid4())
+            profile.user_id = uuid4().hex
         
-        profile.created_at = datetime.now()
-        profile.updated_at = datetime.now()
+        # 创建时间与更新时间取同一时刻
+        profile.created_at = profile.updated_at = datetime.now()
         
         # 保存用户信息
         user_file = os.path.join(self.users_dir, f"{profile.user_id}.json")
-        with open(user_file, 'w', encoding='utf-8') as f:
-            f.write(profile.json())
+        self._atomic_write(user_file, _dump_model(profile))
+        self._cache_model(user_file, self._file_version(user_file), profile.model_copy(deep=True))
         
         return profile
     
@@ -159,74 +287,176 @@ class UserResumeManager:
         """获取用户信息"""
         try:
             user_file = os.path.join(self.users_dir, f"{user_id}.json")
-            if os.path.exists(user_file):
-                with open(user_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return UserProfile(**data)
-            return None
+            return self._load_model(user_file, UserProfile)
         except Exception as e:
             print(f"Error loading user {user_id}: {e}")
             return None
     
+    def _load_model(self, path: str, model_cls: type) -> Optional[BaseModel]:
+        """
+        读取并校验模型文件，文件未变化时直接返回缓存的模型副本
+        
+        Args:
+            path: 模型文件路径
+            model_cls: 模型类
+            
+        Returns:
+            模型实例，文件不存在时返回None
+        """
+        try:
+            version = self._file_version(path)
+        except FileNotFoundError:
+            return None
+        
+        # 文件未变化时直接使用缓存，避免重复读取和校验；
+        # 返回深拷贝，调用方修改嵌套列表不会影响缓存中的模型
+        with self._model_cache_lock:
+            cached = self._model_cache.get(path)
+            if cached is not None and cached[0] == version:
+                self._model_cache.move_to_end(path)
+                return cached[1].model_copy(deep=True)
+        
+        with open(path, 'rb') as f:
+            model = model_cls.model_validate_json(f.read())
+        self._cache_model(path, version, model)
+        return model.model_copy(deep=True)
+    
+    @staticmethod
+    def _file_version(path: str) -> Tuple[int, int, int]:
+        """
+        获取文件版本标识（修改时间、大小、inode）
+        
+        其他 worker 进程可能在文件系统时间戳精度内改写文件，仅比较修改时间不足以发现变化；
+        原子写入通过 os.replace 替换文件，inode 随之改变
+        
+        Args:
+            path: 文件路径
+            
+        Returns:
+            (修改时间纳秒, 文件大小, inode)
+        """
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size, st.st_ino
+    
+    def _cache_model(self, path: str, version: Tuple[int, int, int], model: BaseModel):
+        """
+        缓存模型，超出容量时淘汰最久未使用的条目
+        
+        Args:
+            path: 模型文件路径
+            version: 文件版本标识
+            model: 模型实例
+        """
+        with self._model_cache_lock:
+            self._model_cache[path] = (version, model)
+            self._model_cache.move_to_end(path)
+            while len(self._model_cache) > _MODEL_CACHE_MAXSIZE:
+                self._model_cache.popitem(last=False)
+    
     def update_user(self, profile: UserProfile) -> UserProfile:
         """更新用户信息"""
         profile.updated_at = datetime.now()
         
         user_file = os.path.join(self.users_dir, f"{profile.user_id}.json")
-        with open(user_file, 'w', encoding='utf-8') as f:
-            f.write(profile.json())
+        self._atomic_write(user_file, _dump_model(profile))
+        self._cache_model(user_file, self._file_version(user_file), profile.model_copy(deep=True))
         
         return profile
     
     def create_resume(self, content: ResumeContent) -> ResumeContent:
         """创建简历"""
         if not content.resume_id:
-            import uuid
-            content.resume_id = str(uuid.uuid4())
+            content.resume_id = uuid4().hex
         
-        content.created_at = datetime.now()
-        content.updated_at = datetime.now()
+        # 创建时间与更新时间取同一时刻
+        content.created_at = content.updated_at = datetime.now()
         
         # 保存简历内容
         resume_file = os.path.join(self.resumes_dir, f"{content.resume_id}.json")
-        with open(resume_file, 'w', encoding='utf-8') as f:
-            f.write(content.json())
+        self._atomic_write(resume_file, _dump_model(content))
         
         return content
     
     def get_resume(self, resume_id: str) -> Optional[ResumeContent]:
         """获取简历内容"""
         resume_file = os.path.join(self.resumes_dir, f"{resume_id}.json")
-        if os.path.exists(resume_file):
-            with open(resume_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return ResumeContent(**data)
-        return None
+        return self._load_model(resume_file, ResumeContent)
     
     def update_resume(self, content: ResumeContent) -> ResumeContent:
         """更新简历内容"""
         content.updated_at = datetime.now()
         
         resume_file = os.path.join(self.resumes_dir, f"{content.resume_id}.json")
-        with open(resume_file, 'w', encoding='utf-8') as f:
-            f.write(content.json())
+        self._atomic_write(resume_file, _dump_model(content))
         
         return content
     
     def save_resume_file(self, resume_id: str, file_content: bytes, original_name: str, file_type: str) -> ResumeFile:
         """保存简历文件"""
-        import uuid
-        file_id = str(uuid.uuid4())
-        
-        # 生成文件路径
-        file_extension = original_name.split('.')[-1] if '.' in original_name else file_type
-        file_path = os.path.join(self.files_dir, f"{file_id}.{file_extension}")
+        file_id, file_path = self._new_resume_file_path(original_name, file_type)
         
-        # 保存文件
+        # 保存文件（原始文件同步写入，调用方会直接使用该路径）
         with open(file_path, 'wb') as f:
             f.write(file_content)
         
-        # 创建文件信息
+        return self._save_resume_file_info(file_id, resume_id, file_path, original_name, file_type)
+    
+    def save_resume_file_stream(self, resume_id: str, src_fd: int, size: int, original_name: str, file_type: str) -> ResumeFile:
+        """
+        从文件描述符保存简历文件，由内核直接复制数据，不把整个文件读入内存
+        
+        Args:
+            resume_id: 关联的简历ID
+            src_fd: 源文件描述符（如上传文件的临时文件），从其当前位置开始复制
+            size: 需要复制的字节数
+            original_name: 原始文件名
+            file_type: 文件类型
+            
+        Returns:
+            简历文件信息
+        """
+        file_id, file_path = self._new_resume_file_path(original_name, file_type)
+        
+        dst_fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            remaining = size
+            # Linux 上优先使用 copy_file_range 在内核中复制；不支持时回退到分块读写
+            if hasattr(os, "copy_file_range"):
+                try:
+                    while remaining > 0:
+                        copied = os.copy_file_range(src_fd, dst_fd, remaining)
+                        if copied == 0:
+                            break
+                        remaining -= copied
+                except OSError:
+                    pass
+            while remaining > 0:
+                chunk = os.read(src_fd, min(remaining, _COPY_CHUNK_SIZE))
+                if not chunk:
+                    break
+                os.write(dst_fd, chunk)
+                remaining -= len(chunk)
+        except Exception:
+            os.close(dst_fd)
+            os.remove(file_path)
+            raise
+        os.close(dst_fd)
+        
+        return self._save_resume_file_info(file_id, resume_id, file_path, original_name, file_type)
+    
+    def _new_resume_file_path(self, original_name: str, file_type: str) -> Tuple[str, str]:
+        """
+        为新的简历文件分配ID和保存路径
+        
+        Returns:
+            (文件ID, 文件路径)
+        """
+        file_id = uuid4().hex
+        file_extension = original_name.split('.')[-1] if '.' in original_name else file_type
+        return file_id, os.path.join(self.files_dir, f"{file_id}.{file_extension}")
+    
+    def _save_resume_file_info(self, file_id: str, resume_id: str, file_path: str, original_name: str, file_type: str) -> ResumeFile:
+        """创建并保存简历文件信息"""
         resume_file = ResumeFile(
             file_id=file_id,
             resume_id=resume_id,
@@ -235,72 +465,74 @@ class UserResumeManager:
             original_name=original_name
         )
         
-        # 保存文件信息
         file_info_path = os.path.join(self.files_dir, f"{file_id}.json")
-        with open(file_info_path, 'w', encoding='utf-8') as f:
-            f.write(resume_file.json())
+        self._atomic_write(file_info_path, _dump_model(resume_file))
         
         return resume_file
     
     def get_resume_file(self, file_id: str) -> Optional[ResumeFile]:
         """获取简历文件信息"""
         file_info_path = os.path.join(self.files_dir, f"{file_id}.json")
-        if os.path.exists(file_info_path):
-            with open(file_info_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return ResumeFile(**data)
-        return None
+        return self._load_model(file_info_path, ResumeFile)
     
     def save_parsed_resume_data(self, file_id: str, parsed_data: Dict) -> bool:
         """保存解析后的简历数据到文件"""
         file_info_path = os.path.join(self.files_dir, f"{file_id}.json")
+        # 只需确认文件信息存在，无需读取和校验其内容
         if os.path.exists(file_info_path):
-            with open(file_info_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                resume_file = ResumeFile(**data)
-            
-            # 保存解析数据到单独的文件
-            parsed_data_path = os.path.join(self.files_dir, f"{file_id}_parsed.json")
-            with open(parsed_data_path, 'w', encoding='utf-8') as f:
-                json.dump(parsed_data, f, ensure_ascii=False, indent=2)
+            # 保存解析数据到数据库
+            with self._db_lock, self._db:
+                self._db.execute(_SQL_UPSERT_PARSED, (file_id, orjson.dumps(parsed_data)))
             
             return True
         return False
     
     def get_parsed_resume_data(self, file_id: str) -> Optional[Dict]:
         """获取解析后的简历数据"""
+        with self._db_lock:
+            row = self._db.execute(_SQL_SELECT_PARSED, (file_id,)).fetchone()
+        if row is not None:
+            return orjson.loads(row[0])
+        
+        # 兼容旧版本按文件保存的解析数据
         parsed_data_path = os.path.join(self.files_dir, f"{file_id}_parsed.json")
-        if os.path.exists(parsed_data_path):
-            with open(parsed_data_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return None
+        try:
+            with open(parsed_data_path, 'rb') as f:
+                return orjson.loads(f.read())
+        except FileNotFoundError:
+            return None
     
     def save_resume_formats(self, resume_id: str, formats: ResumeFormats) -> bool:
         """保存简历多格式版本"""
         if not formats.formats_id:
-            import uuid
-            formats.formats_id = str(uuid.uuid4())
+            formats.formats_id = uuid4().hex
         
         formats.resume_id = resume_id
         formats.generated_at = datetime.now()
         
         formats_file = os.path.join(self.files_dir, f"{formats.formats_id}_formats.json")
-        with open(formats_file, 'w', encoding='utf-8') as f:
-            f.write(formats.json())
+        self._atomic_write(formats_file, _dump_model(formats))
+        
+        # 更新索引（单条写入，不会覆盖其他进程写入的条目）
+        with self._db_lock, self._db:
+            self._db.execute(_SQL_UPSERT_FORMATS_INDEX, (resume_id, formats.formats_id))
         return True
     
     def get_resume_formats(self, resume_id: str) -> Optional[ResumeFormats]:
         """获取简历多格式版本"""
-        # 查找与简历ID关联的格式信息
-        for filename in os.listdir(self.files_dir):
-            if filename.endswith('_formats.json'):
-                formats_file = os.path.join(self.files_dir, filename)
-                with open(formats_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    formats = ResumeFormats(**data)
-                    if formats.resume_id == resume_id:
-                        return formats
-        return None
+        # 通过索引找到与简历ID关联的格式信息
+        with self._db_lock:
+            row = self._db.execute(_SQL_SELECT_FORMATS_INDEX, (resume_id,)).fetchone()
+        if row is None:
+            return None
+        formats_id = row[0]
+        
+        formats_file = os.path.join(self.files_dir, f"{formats_id}_formats.json")
+        try:
+            with open(formats_file, 'rb') as f:
+                return ResumeFormats.model_validate_json(f.read())
+        except FileNotFoundError:
+            return None
 
 # 使用示例
 if __name__ == "__main__":
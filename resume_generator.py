@@ -10,12 +10,143 @@ from reportlab.lib.units import inch
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from docx import Document
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+import multiprocessing
 import os
-from typing import Dict
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from config import Config
+
+# 行分类正则：各分支以 \A 起的前瞻按原 if/elif 顺序排列，保证多个标记同时出现时优先级不变，
+# 每行只需一次正则匹配即可通过 lastgroup 得到分类
+_PDF_LINE_KIND = re.compile(
+    r"\A(?:(?P<separator>===|---)"
+    r"|(?=.*?优化后的简历)(?P<title>)"
+    r"|(?=.*?针对职位:)(?P<position>)"
+    r"|(?=.*?公司:)(?P<company>)"
+    r"|(?=.*?优化说明:)(?P<notes>))"
+)
+# DOCX 的标题固定写入文档开头，不识别"优化后的简历"行
+_DOCX_LINE_KIND = re.compile(
+    r"\A(?:(?P<separator>===|---)"
+    r"|(?=.*?针对职位:)(?P<position>)"
+    r"|(?=.*?公司:)(?P<company>)"
+    r"|(?=.*?优化说明:)(?P<notes>))"
+)
+# 优化说明中的编号列表项（1. 2. ... 10. 等）
+_LIST_ITEM_RE = re.compile(r"[1-9]\d*\.")
+
+# 样式表和 ATS 标题样式在模块加载时创建一次，所有生成调用共用
+_STYLES = getSampleStyleSheet()
+_ATS_HEADING_STYLE = ParagraphStyle(
+    'Heading',
+    parent=_STYLES['Normal'],
+    fontSize=14,
+    spaceAfter=12,
+    bold=True
+)
+
+def _register_chinese_font() -> str:
+    """
+    尝试注册中文字体
+    
+    Returns:
+        可用的字体名称，注册失败时回退到 Helvetica
+    """
+    try:
+        # 尝试使用系统中的中文字体
+        import platform
+        if platform.system() == 'Windows':
+            # Windows系统字体路径
+            font_paths = [
+                'C:/Windows/Fonts/msyh.ttc',  # 微软雅黑
+                'C:/Windows/Fonts/simhei.ttf',  # 黑体
+                'C:/Windows/Fonts/simsun.ttc',  # 宋体
+            ]
+            
+            for font_path in font_paths:
+                if os.path.exists(font_path):
+                    try:
+                        pdfmetrics.registerFont(TTFont('ChineseFont', font_path))
+                        return 'ChineseFont'
+                    except:
+                        continue
+            
+            return 'Helvetica'  # 回退到默认字体
+        else:
+            return 'Helvetica'  # 非Windows系统使用默认字体
+    except:
+        return 'Helvetica'  # 出错时使用默认字体
+
+@lru_cache(maxsize=None)
+def _pdf_styles() -> Tuple[ParagraphStyle, ParagraphStyle, ParagraphStyle]:
+    """
+    获取支持中文的PDF样式，首次调用时注册字体并创建样式，之后直接复用
+    
+    Returns:
+        (标题样式, 小标题样式, 正文样式)
+    """
+    font_name = _register_chinese_font()
+    
+    title_style = ParagraphStyle(
+        'ChineseTitle',
+        parent=_STYLES['Title'],
+        fontName=font_name,
+        fontSize=18,
+        spaceAfter=12
+    )
+    
+    heading_style = ParagraphStyle(
+        'ChineseHeading',
+        parent=_STYLES['Heading2'],
+        fontName=font_name,
+        fontSize=14,
+        spaceAfter=6
+    )
+    
+    normal_style = ParagraphStyle(
+        'ChineseNormal',
+        parent=_STYLES['Normal'],
+        fontName=font_name,
+        fontSize=12,
+        spaceAfter=6
+    )
+    
+    return title_style, heading_style, normal_style
+
+# 批量生成进程池的默认进程数（ReportLab 排版为纯 Python 计算，受 GIL 限制，只能靠多进程并行）
+_GENERATE_WORKERS = Config.BATCH_WORKERS
+
+# 子进程中复用的简历生成器
+_worker_generator: Optional["ResumeGenerator"] = None
+
+def _generate_in_worker(content: str, format_type: str, output_path: str) -> str:
+    """
+    在批量生成进程池中执行的简历生成，每个子进程只创建一次生成器
+    
+    Args:
+        content: 优化后的简历内容
+        format_type: 文件格式
+        output_path: 输出文件路径（不含扩展名）
+        
+    Returns:
+        生成的文件路径
+    """
+    global _worker_generator
+    if _worker_generator is None:
+        _worker_generator = ResumeGenerator()
+    return _worker_generator.generate_resume(content, format_type, output_path)
 
 class ResumeGenerator:
     def __init__(self):
-        pass
+        # 批量生成进程池，首次批量生成时创建
+        self._batch_pool: Optional[ProcessPoolExecutor] = None
+        self._batch_pool_workers = 0
+        self._batch_pool_lock = threading.Lock()
     
     def generate_resume(self, optimized_content: str, format_type: str = "pdf", output_path: str = "resume_output") -> str:
         """
@@ -36,6 +167,59 @@ class ResumeGenerator:
         else:
             raise ValueError(f"不支持的文件格式: {format_type}")
     
+    def generate_batch(self, jobs: List[Tuple[str, str, str]], max_workers: Optional[int] = None) -> List[str]:
+        """
+        批量生成简历文件，多个任务在进程池中并行生成
+        
+        Args:
+            jobs: 生成任务列表，每项为 (优化后的简历内容, 文件格式, 输出文件路径（不含扩展名）)
+            max_workers: 进程数，默认为 Config.BATCH_WORKERS（CPU核数）；在服务进程中调用时应传入 Config.PROCESS_POOL_WORKERS
+            
+        Returns:
+            生成的文件路径列表，顺序与任务一致
+        """
+        max_workers = max_workers or _GENERATE_WORKERS
+        if len(jobs) <= 1 or max_workers <= 1:
+            return [self.generate_resume(*job) for job in jobs]
+        
+        try:
+            return list(self._get_batch_pool(max_workers).map(_generate_in_worker, *zip(*jobs)))
+        except BrokenProcessPool:
+            # 进程池不可用时在当前进程中逐个生成
+            with self._batch_pool_lock:
+                self._batch_pool = None
+            return [self.generate_resume(*job) for job in jobs]
+    
+    def _get_batch_pool(self, max_workers: int) -> ProcessPoolExecutor:
+        """
+        获取批量生成进程池（首次使用时创建，进程数变化时重建）
+        
+        Args:
+            max_workers: 进程数
+            
+        Returns:
+            进程池
+        """
+        with self._batch_pool_lock:
+            if self._batch_pool is not None and self._batch_pool_workers != max_workers:
+                self._batch_pool.shutdown(wait=False)
+                self._batch_pool = None
+            if self._batch_pool is None:
+                # 服务进程中存在多个线程，使用 spawn 而不是 fork 创建子进程
+                self._batch_pool = ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+                self._batch_pool_workers = max_workers
+            return self._batch_pool
+    
+    def close(self):
+        """关闭批量生成进程池"""
+        with self._batch_pool_lock:
+            batch_pool, self._batch_pool = self._batch_pool, None
+        if batch_pool is not None:
+            batch_pool.shutdown(wait=False, cancel_futures=True)
+    
     def _generate_pdf(self, content: str, output_path: str) -> str:
         """
         生成PDF格式简历
@@ -52,81 +236,24 @@ class ResumeGenerator:
             doc = SimpleDocTemplate(output_path, pagesize=letter)
             story = []
             
-            # 获取样式表
-            styles = getSampleStyleSheet()
-            
-            # 尝试注册中文字体
-            try:
-                # 尝试使用系统中的中文字体
-                import platform
-                if platform.system() == 'Windows':
-                    # Windows系统字体路径
-                    font_paths = [
-                        'C:/Windows/Fonts/msyh.ttc',  # 微软雅黑
-                        'C:/Windows/Fonts/simhei.ttf',  # 黑体
-                        'C:/Windows/Fonts/simsun.ttc',  # 宋体
-                    ]
-                    
-                    font_registered = False
-                    for font_path in font_paths:
-                        if os.path.exists(font_path):
-                            try:
-                                pdfmetrics.registerFont(TTFont('ChineseFont', font_path))
-                                font_registered = True
-                                break
-                            except:
-                                continue
-                    
-                    if font_registered:
-                        font_name = 'ChineseFont'
-                    else:
-                        font_name = 'Helvetica'  # 回退到默认字体
-                else:
-                    font_name = 'Helvetica'  # 非Windows系统使用默认字体
-            except:
-                font_name = 'Helvetica'  # 出错时使用默认字体
-            
-            # 创建支持中文的样式
-            title_style = ParagraphStyle(
-                'ChineseTitle',
-                parent=styles['Title'],
-                fontName=font_name if font_name != 'ChineseFont' else 'ChineseFont',
-                fontSize=18,
-                spaceAfter=12
-            )
-            
-            heading_style = ParagraphStyle(
-                'ChineseHeading',
-                parent=styles['Heading2'],
-                fontName=font_name if font_name != 'ChineseFont' else 'ChineseFont',
-                fontSize=14,
-                spaceAfter=6
-            )
-            
-            normal_style = ParagraphStyle(
-                'ChineseNormal',
-                parent=styles['Normal'],
-                fontName=font_name if font_name != 'ChineseFont' else 'ChineseFont',
-                fontSize=12,
-                spaceAfter=6
-            )
+            title_style, heading_style, normal_style = _pdf_styles()
             
             # 解析内容并添加到PDF
-            lines = content.split('\n')
-            for line in lines:
-                if line.startswith("===") or line.startswith("---"):
+            classify = _PDF_LINE_KIND.match
+            for line in content.splitlines():
+                m = classify(line)
+                kind = m.lastgroup if m else None
+                if kind == "separator":
                     # 分隔线，跳过或添加空格
                     story.append(Spacer(1, 0.2*inch))
-                elif "优化后的简历" in line:
+                elif kind == "title":
                     story.append(Paragraph("优化后的简历", title_style))
                     story.append(Spacer(1, 0.2*inch))
-                elif "针对职位:" in line:
-                    story.append(Paragraph(line, heading_style))
-                elif "公司:" in line:
+                elif kind == "position" or kind == "company":
                     story.append(Paragraph(line, heading_style))
-                elif "优化说明:" in line:
+                elif kind == "notes":
                     story.append(Paragraph("优化说明", heading_style))
-                elif line.strip() and not line.isspace():
+                elif line and not line.isspace():
                     story.append(Paragraph(line, normal_style))
                 else:
                     story.append(Spacer(1, 0.1*inch))
@@ -156,23 +283,26 @@ class ResumeGenerator:
             doc.add_heading('优化后的简历', 0)
             
             # 解析内容并添加到文档
-            lines = content.split('\n')
+            classify = _DOCX_LINE_KIND.match
+            is_list_item = _LIST_ITEM_RE.match
             in_optimization_notes = False
             
-            for line in lines:
-                if line.startswith("===") or line.startswith("---"):
+            for line in content.splitlines():
+                m = classify(line)
+                kind = m.lastgroup if m else None
+                if kind == "separator":
                     # 跳过分隔线
                     continue
-                elif "针对职位:" in line:
+                elif kind == "position":
                     doc.add_heading('职位信息', level=1)
                     doc.add_paragraph(line)
-                elif "公司:" in line:
+                elif kind == "company":
                     doc.add_paragraph(line)
-                elif "优化说明:" in line:
+                elif kind == "notes":
                     doc.add_heading('优化说明', level=1)
                     in_optimization_notes = True
-                elif line.strip() and not line.isspace():
-                    if in_optimization_notes and line.startswith(("1.", "2.", "3.", "4.", "5.")):
+                elif line and not line.isspace():
+                    if in_optimization_notes and is_list_item(line):
                         # 处理列表项
                         doc.add_paragraph(line, style='List Number')
                     else:
@@ -201,15 +331,8 @@ class ResumeGenerator:
             story = []
             
             # 使用简单样式确保ATS友好
-            styles = getSampleStyleSheet()
-            normal_style = styles['Normal']
-            heading_style = ParagraphStyle(
-                'Heading',
-                parent=normal_style,
-                fontSize=14,
-                spaceAfter=12,
-                bold=True
-            )
+            normal_style = _STYLES['Normal']
+            heading_style = _ATS_HEADING_STYLE
             
             # 添加联系信息
             contact_info = resume_data.get("contact_info", {})
@@ -3,25 +3,193 @@
 根据职位要求优化简历内容，提高匹配度和ATS通过率
 """
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+import math
+import multiprocessing
 import re
+import threading
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+
+from config import Config
+
+# 批量优化时，简历数量达到该值才分发到多进程并行处理（进程启动开销需要足够多的简历来摊薄）
+_PARALLEL_MIN_BATCH = 16
+_BATCH_CHUNKSIZE = 8
+
+# 关键词提取：停用词集合与分词正则在模块加载时构建一次
+_STOP_WORDS = frozenset([
+    '的', '了', '在', '是', '我', '有', '和', '或', '但', '也',
+    'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'with', 'by', 'from'
+])
+# 不使用 \b 边界：中文不以空格分词，且 \b 在中英文相邻处（如“熟悉Python”）不成立
+_KEYWORD_RE = re.compile(r'[a-zA-Z]{3,}|[\u4e00-\u9fff]{2,6}')
+
+# 职位描述中表示教育、项目要求的关键词（子串匹配）
+_EDU_KEYWORDS = ('学历', '学位', '教育', '毕业', '学历要求', 'degree', 'education', 'bachelor', 'master')
+_PROJECT_KEYWORDS = ('项目', 'project', 'experience')
+
+# 电话号码格式检查
+_PHONE_RE = re.compile(r'[\d\-\s\(\)\+]+')
+
+# 优化后简历内容中的分隔线，以及联系信息字段的输出顺序和标签
+_SECTION_RULE = "-" * 50 + "\n"
+_CONTACT_FIELDS = (
+    ("name", "姓名"),
+    ("email", "邮箱"),
+    ("phone", "电话"),
+    ("linkedin", "LinkedIn"),
+    ("github", "GitHub"),
+)
+
+# ATS友好的动词列表
+_ATS_ACTION_VERBS = (
+    "achieved", "improved", "managed", "developed", "implemented", "created", "led", "optimized",
+    "designed", "built", "maintained", "collaborated", "analyzed", "solved", "increased", "decreased",
+    "streamlined", "innovated", "mentored", "trained", "negotiated", "strategized", "transformed"
+)
+
+# 中文动词列表
+_CHINESE_ACTION_VERBS = (
+    "实现", "提升", "管理", "开发", "实施", "创建", "领导", "优化",
+    "设计", "构建", "维护", "协作", "分析", "解决", "增加", "减少",
+    "简化", "创新", "指导", "培训", "谈判", "制定", "转型"
+)
+
+@lru_cache(maxsize=256)
+def _job_requirement_flags(job_description: str) -> Tuple[bool, bool]:
+    """
+    检查职位描述中是否有教育、项目经验要求，同一职位描述的结果会被缓存
+    
+    Args:
+        job_description: 职位描述
+        
+    Returns:
+        (是否有教育要求, 是否有项目经验要求)
+    """
+    job_description_lower = job_description.lower()
+    return (
+        any(keyword in job_description_lower for keyword in _EDU_KEYWORDS),
+        any(keyword in job_description_lower for keyword in _PROJECT_KEYWORDS),
+    )
+
+def _has_at_least(text: str, words: Tuple[str, ...], k: int) -> bool:
+    """
+    判断文本中是否至少包含 k 个给定的词，找到 k 个后立即停止扫描
+    
+    Args:
+        text: 待检查文本
+        words: 候选词
+        k: 需要的最少个数
+        
+    Returns:
+        是否至少包含 k 个
+    """
+    found = 0
+    for word in words:
+        if word in text:
+            found += 1
+            if found >= k:
+                return True
+    return False
+
+def _tokenize_keywords(text: str) -> List[str]:
+    """
+    提取文本中的重要关键词（英文单词和中文词组，去除停用词）
+    
+    Args:
+        text: 待分词文本
+        
+    Returns:
+        关键词列表（小写，含重复）
+    """
+    # 移除常见停用词，保留重要词汇
+    words = _KEYWORD_RE.findall(text.lower())
+    return [word for word in words if word not in _STOP_WORDS and len(word) > 2]
+
+@lru_cache(maxsize=256)
+def _extract_job_keywords(job_description: str) -> Dict[str, int]:
+    """
+    统计职位描述中各关键词的词频，同一职位描述的结果会被缓存
+    
+    Args:
+        job_description: 职位描述
+        
+    Returns:
+        关键词到出现次数的映射（调用方不得修改）
+    """
+    return Counter(_tokenize_keywords(job_description))
+
+def _tfidf_cosine(job_tf: Dict[str, int], resume_tf: Dict[str, int]) -> float:
+    """
+    计算职位描述与简历在 TF-IDF 加权下的余弦相似度
+    
+    以两篇文档为语料，权重与 scikit-learn 的 TfidfVectorizer(smooth_idf=True, norm='l2') 一致：
+    idf = ln((1 + 文档数) / (1 + 文档频率)) + 1，两边都出现的词权重较低，只在一边出现的词权重较高
+    
+    Args:
+        job_tf: 职位描述词频
+        resume_tf: 简历词频
+        
+    Returns:
+        余弦相似度 (0-1)
+    """
+    shared_idf = 1.0  # ln(3 / 3) + 1
+    single_idf = math.log(1.5) + 1.0  # ln(3 / 2) + 1
+    
+    dot = 0.0
+    job_norm = 0.0
+    for term, tf in job_tf.items():
+        resume_count = resume_tf.get(term)
+        if resume_count:
+            weight = tf * shared_idf
+            dot += weight * resume_count * shared_idf
+        else:
+            weight = tf * single_idf
+        job_norm += weight * weight
+    
+    resume_norm = 0.0
+    for term, tf in resume_tf.items():
+        weight = tf * (shared_idf if term in job_tf else single_idf)
+        resume_norm += weight * weight
+    
+    if not dot:
+        return 0.0
+    return dot / math.sqrt(job_norm * resume_norm)
+
+# 子进程中复用的简历优化器
+_worker_optimizer: Optional["ResumeOptimizer"] = None
+
+def _optimize_in_worker(job_info: Dict, resume_data: Dict) -> Dict:
+    """
+    在批量优化进程池中执行的简历优化，每个子进程只创建一次优化器
+    
+    Args:
+        job_info: 职位信息字典
+        resume_data: 简历数据字典
+        
+    Returns:
+        优化结果
+    """
+    global _worker_optimizer
+    if _worker_optimizer is None:
+        _worker_optimizer = ResumeOptimizer()
+    return _worker_optimizer.optimize_resume(job_info, resume_data)
 
 class ResumeOptimizer:
     def __init__(self):
         # ATS友好的动词列表
-        self.ats_action_verbs = [
-            "achieved", "improved", "managed", "developed", "implemented", "created", "led", "optimized",
-            "designed", "built", "maintained", "collaborated", "analyzed", "solved", "increased", "decreased",
-            "streamlined", "innovated", "mentored", "trained", "negotiated", "strategized", "transformed"
-        ]
+        self.ats_action_verbs = _ATS_ACTION_VERBS
         
         # 中文动词列表
-        self.chinese_action_verbs = [
-            "实现", "提升", "管理", "开发", "实施", "创建", "领导", "优化",
-            "设计", "构建", "维护", "协作", "分析", "解决", "增加", "减少",
-            "简化", "创新", "指导", "培训", "谈判", "制定", "转型"
-        ]
+        self.chinese_action_verbs = _CHINESE_ACTION_VERBS
+        
+        # 批量优化进程池，首次并行批量优化时创建，之后复用（避免每批重新启动子进程）
+        self._batch_pool: Optional[ProcessPoolExecutor] = None
+        self._batch_pool_workers = 0
+        self._batch_pool_lock = threading.Lock()
     
     def optimize_resume(self, job_info: Dict, resume_data: Dict) -> Dict:
         """
@@ -34,17 +202,17 @@ class ResumeOptimizer:
         Returns:
             优化建议和优化后的简历内容
         """
-        # 计算匹配度
+        # 计算匹配度（只计算一次，传给后续步骤复用）
         match_score = self._calculate_match_score(job_info, resume_data)
         
         # 生成优化建议
-        suggestions = self._generate_suggestions(job_info, resume_data)
+        suggestions = self._generate_suggestions(job_info, resume_data, match_score)
         
         # 生成ATS优化建议
         ats_suggestions = self._generate_ats_suggestions(resume_data)
         
         # 优化简历内容
-        optimized_content = self._optimize_content(job_info, resume_data)
+        optimized_content = self._optimize_content(job_info, resume_data, match_score, suggestions, ats_suggestions)
         
         return {
             "match_score": match_score,
@@ -53,6 +221,64 @@ class ResumeOptimizer:
             "optimized_content": optimized_content
         }
     
+    def batch_optimize(self, job_info: Dict, resumes: List[Dict], max_workers: Optional[int] = None) -> List[Dict]:
+        """
+        针对同一职位批量优化多份简历
+        
+        职位一侧的分析（关键词词频、教育/项目要求）按职位描述缓存，每个进程只计算一次；
+        简历较多时分发到进程池并行处理，每份简历的结果与单独调用 optimize_resume 完全一致
+        
+        Args:
+            job_info: 职位信息字典
+            resumes: 简历数据字典列表
+            max_workers: 并行进程数，默认为 Config.BATCH_WORKERS（与批量生成一致）；小于等于1时在当前进程中逐个处理
+            
+        Returns:
+            与 resumes 顺序一致的优化结果列表
+        """
+        max_workers = max_workers or Config.BATCH_WORKERS
+        if max_workers > 1 and len(resumes) >= _PARALLEL_MIN_BATCH:
+            try:
+                return list(self._get_batch_pool(max_workers).map(
+                    _optimize_in_worker, [job_info] * len(resumes), resumes, chunksize=_BATCH_CHUNKSIZE
+                ))
+            except BrokenProcessPool:
+                # 进程池不可用时丢弃，回退到当前进程中处理
+                with self._batch_pool_lock:
+                    self._batch_pool = None
+        
+        return [self.optimize_resume(job_info, resume_data) for resume_data in resumes]
+    
+    def _get_batch_pool(self, max_workers: int) -> ProcessPoolExecutor:
+        """
+        获取批量优化进程池（首次使用时创建，进程数变化时重建）
+        
+        Args:
+            max_workers: 进程数
+            
+        Returns:
+            进程池
+        """
+        with self._batch_pool_lock:
+            if self._batch_pool is not None and self._batch_pool_workers != max_workers:
+                self._batch_pool.shutdown(wait=False)
+                self._batch_pool = None
+            if self._batch_pool is None:
+                # 调用方可能是多线程的服务进程，使用 spawn 而不是 fork 创建子进程
+                self._batch_pool = ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+                self._batch_pool_workers = max_workers
+            return self._batch_pool
+    
+    def close(self):
+        """关闭批量优化进程池"""
+        with self._batch_pool_lock:
+            batch_pool, self._batch_pool = self._batch_pool, None
+        if batch_pool is not None:
+            batch_pool.shutdown(wait=False, cancel_futures=True)
+    
     def _calculate_match_score(self, job_info: Dict, resume_data: Dict) -> float:
         """
         计算简历与职位的匹配度
@@ -125,15 +351,44 @@ class ResumeOptimizer:
         if not required_skills:
             return 1.0, 0.0  # 如果没有明确技能要求，则满分但不计入总分
             
-        matched_skills = 0
-        for skill in required_skills:
-            # 检查技能是否在简历中（不区分大小写）
-            for resume_skill in resume_skills:
-                if skill.lower() in resume_skill.lower() or resume_skill.lower() in skill.lower():
-                    matched_skills += 1
-                    break
+        matched_skills, _ = self._match_skills(required_skills, resume_skills)
+        
+        return len(matched_skills) / len(required_skills), 1.0
+    
+    @staticmethod
+    def _match_skills(required_skills: List[str], resume_skills: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        检查职位要求的技能是否出现在简历中（不区分大小写，两者互相包含即视为匹配）
         
-        return matched_skills / len(required_skills), 1.0
+        Args:
+            required_skills: 职位要求的技能
+            resume_skills: 简历中的技能
+            
+        Returns:
+            (已匹配的技能, 缺少的技能)，保持职位要求中的顺序
+        """
+        if not resume_skills:
+            return [], list(required_skills)
+        
+        # 简历技能只转换一次小写；完全相同的技能走集合查找，
+        # 互相包含的情况分别用拼接后的整串和一个交替正则在 C 层一次扫描完成
+        resume_lower = [resume_skill.lower() for resume_skill in resume_skills]
+        exact = set(resume_lower)
+        joined = "\x00".join(resume_lower)
+        contains_resume_skill = re.compile(
+            "|".join(map(re.escape, sorted(exact, key=len, reverse=True)))
+        ).search
+        
+        matched, missing = [], []
+        for skill in required_skills:
+            skill_lower = skill.lower()
+            if (skill_lower in exact
+                    or ("\x00" not in skill_lower and skill_lower in joined)
+                    or contains_resume_skill(skill_lower)):
+                matched.append(skill)
+            else:
+                missing.append(skill)
+        return matched, missing
     
     def _calculate_experience_match(self, requirements: List[str], work_experience: List[Dict]) -> Tuple[float, float]:
         """
@@ -142,22 +397,18 @@ class ResumeOptimizer:
         if not requirements:
             return 1.0, 0.0
             
-        # 检查工作经验描述中是否包含要求的关键词
-        experience_items = []
-        for exp in work_experience:
-            if isinstance(exp, dict):
-                exp_text = f"{exp.get('company', '')} {exp.get('title', '')} {exp.get('description', '')}"
-                experience_items.append(exp_text)
-            else:
-                experience_items.append(str(exp))
-        
-        experience_text = " ".join(experience_items)
-        matched_requirements = 0
-        
-        for req in requirements:
-            # 简化处理，实际应用中需要更复杂的语义分析
-            if isinstance(req, str) and req.lower() in experience_text.lower():
-                matched_requirements += 1
+        # 检查工作经验描述中是否包含要求的关键词（经验文本只拼接并转换小写一次）
+        experience_text = " ".join(
+            f"{exp.get('company', '')} {exp.get('title', '')} {exp.get('description', '')}"
+            if isinstance(exp, dict) else str(exp)
+            for exp in work_experience
+        ).lower()
+        
+        # 简化处理，实际应用中需要更复杂的语义分析
+        matched_requirements = sum(
+            1 for req in requirements
+            if isinstance(req, str) and req.lower() in experience_text
+        )
                 
         return matched_requirements / len(requirements), 1.0
     
@@ -166,8 +417,7 @@ class ResumeOptimizer:
         计算教育背景匹配度
         """
         # 检查职位描述中是否有教育相关要求
-        edu_keywords = ['学历', '学位', '教育', '毕业', '学历要求', 'degree', 'education', 'bachelor', 'master']
-        has_edu_requirement = any(keyword in job_description.lower() for keyword in edu_keywords)
+        has_edu_requirement, _ = _job_requirement_flags(job_description)
         
         if not has_edu_requirement:
             return 1.0, 0.0  # 没有教育要求则满分但不计入总分
@@ -182,34 +432,27 @@ class ResumeOptimizer:
         """
         计算关键词匹配度
         """
-        # 提取职位描述中的重要关键词
-        # 移除常见停用词，保留重要词汇
-        stop_words = ['的', '了', '在', '是', '我', '有', '和', '或', '但', '也', 
-                     'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'with', 'by', 'from']
-        
-        # 更精确的关键词提取
-        job_words = re.findall(r'\b[a-zA-Z]{3,}\b|\b[\u4e00-\u9fff]{2,6}\b', job_description.lower())
-        job_keywords = [word for word in job_words if word not in stop_words and len(word) > 2]
+        job_tf = _extract_job_keywords(job_description)
         
-        if not job_keywords:
+        if not job_tf:
             return 1.0, 0.0
-            
-        matched_keywords = 0
-        resume_text_lower = resume_text.lower()
         
-        for keyword in job_keywords:
-            if keyword in resume_text_lower:
-                matched_keywords += 1
-                
-        return matched_keywords / len(job_keywords), 1.0
+        # 简历词频按子串统计职位关键词的出现次数（中文简历不分词也能匹配），
+        # 再按 TF-IDF 加权的余弦相似度计分，不再把每个关键词视为同等重要
+        resume_text_lower = resume_text.lower()
+        resume_tf = {}
+        for keyword in job_tf:
+            count = resume_text_lower.count(keyword)
+            if count:
+                resume_tf[keyword] = count
+        return _tfidf_cosine(job_tf, resume_tf), 1.0
     
     def _calculate_project_match(self, job_description: str, projects: List[Dict]) -> Tuple[float, float]:
         """
         计算项目经验匹配度
         """
         # 检查职位描述中是否有项目相关要求
-        project_keywords = ['项目', 'project', 'experience']
-        has_project_requirement = any(keyword in job_description.lower() for keyword in project_keywords)
+        _, has_project_requirement = _job_requirement_flags(job_description)
         
         if not has_project_requirement:
             return 1.0, 0.0  # 没有项目要求则满分但不计入总分
@@ -221,10 +464,15 @@ class ResumeOptimizer:
         # 简化处理，如果有项目经验就给满分
         return 1.0, 1.0
     
-    def _generate_suggestions(self, job_info: Dict, resume_data: Dict) -> List[str]:
+    def _generate_suggestions(self, job_info: Dict, resume_data: Dict, match_score: Optional[float] = None) -> List[str]:
         """
         生成简历优化建议
         
+        Args:
+            job_info: 职位信息
+            resume_data: 简历数据
+            match_score: 已计算的匹配度，未传入时重新计算
+            
         Returns:
             优化建议列表
         """
@@ -234,15 +482,7 @@ class ResumeOptimizer:
         required_skills = job_info.get("key_skills", [])
         resume_skills = resume_data.get("skills", [])
         
-        missing_skills = []
-        for skill in required_skills:
-            found = False
-            for resume_skill in resume_skills:
-                if skill.lower() in resume_skill.lower() or resume_skill.lower() in skill.lower():
-                    found = True
-                    break
-            if not found:
-                missing_skills.append(skill)
+        _, missing_skills = self._match_skills(required_skills, resume_skills)
         
         if missing_skills:
             suggestions.append(f"建议在技能部分添加: {', '.join(missing_skills)}")
@@ -264,8 +504,7 @@ class ResumeOptimizer:
         education = resume_data.get("education", [])
         job_description = job_info.get("description", "")
         
-        edu_keywords = ['学历', '学位', '教育', '毕业', '学历要求', 'degree', 'education', 'bachelor', 'master']
-        has_edu_requirement = any(keyword in job_description.lower() for keyword in edu_keywords)
+        has_edu_requirement, _ = _job_requirement_flags(job_description)
         
         if has_edu_requirement and not education:
             suggestions.append("职位描述中包含教育要求，建议补充您的教育背景信息")
@@ -283,7 +522,8 @@ class ResumeOptimizer:
             suggestions.append(f"建议在简历中加入目标职位关键词: '{job_info.get('title', '')}'")
         
         # 如果匹配度较低，提供通用建议
-        match_score = self._calculate_match_score(job_info, resume_data)
+        if match_score is None:
+            match_score = self._calculate_match_score(job_info, resume_data)
         if match_score < 50:
             suggestions.append("您的简历与职位要求匹配度较低，建议进行全面优化")
         elif match_score < 70:
@@ -310,7 +550,7 @@ class ResumeOptimizer:
             suggestions.append("建议添加有效的邮箱地址，便于ATS系统识别")
         
         phone = contact_info.get("phone", "")
-        if phone and (not re.match(r'[\d\-\s\(\)\+]+', phone) or len(phone) < 10):
+        if phone and (not _PHONE_RE.match(phone) or len(phone) < 10):
             suggestions.append("建议使用标准格式的电话号码，避免使用特殊符号")
         
         # 检查技能部分格式
@@ -331,13 +571,11 @@ class ResumeOptimizer:
             combined_description = " ".join(exp_descriptions).lower()
             
             # 检查是否包含足够的动作动词
-            action_verbs_used = [verb for verb in self.ats_action_verbs if verb in combined_description]
-            if len(action_verbs_used) < 3:
+            if not _has_at_least(combined_description, self.ats_action_verbs, 3):
                 suggestions.append("建议在工作经历中使用更多ATS友好的动作动词，如: achieved, managed, developed等")
             
             # 检查是否包含中文动作动词
-            chinese_verbs_used = [verb for verb in self.chinese_action_verbs if verb in combined_description]
-            if len(chinese_verbs_used) < 3:
+            if not _has_at_least(combined_description, self.chinese_action_verbs, 3):
                 suggestions.append("建议在工作经历中使用更多量化成果的动词，如: 实现、提升、管理等")
         
         # 检查文件格式
@@ -347,53 +585,64 @@ class ResumeOptimizer:
         
         return suggestions
 
-    def _optimize_content(self, job_info: Dict, resume_data: Dict) -> str:
+    def _optimize_content(self, job_info: Dict, resume_data: Dict,
+                          match_score: Optional[float] = None,
+                          suggestions: Optional[List[str]] = None,
+                          ats_suggestions: Optional[List[str]] = None) -> str:
         """
         优化简历内容
         
+        Args:
+            job_info: 职位信息
+            resume_data: 简历数据
+            match_score: 已计算的匹配度，未传入时重新计算
+            suggestions: 已生成的优化建议，未传入时重新生成
+            ats_suggestions: 已生成的ATS优化建议，未传入时重新生成
+            
         Returns:
             优化后的简历内容
         """
-        # 构建优化后的简历内容
-        optimized_parts = []
-        
-        # 添加标题和基本信息
-        optimized_parts.append("=== 优化后的简历 ===\n")
-        optimized_parts.append(f"目标职位: {job_info.get('title', '未知职位')}\n")
-        optimized_parts.append(f"目标公司: {job_info.get('company', '未知公司')}\n")
-        optimized_parts.append(f"匹配度评分: {self._calculate_match_score(job_info, resume_data)}%\n")
-        optimized_parts.append("-" * 50 + "\n")
+        if match_score is None:
+            match_score = self._calculate_match_score(job_info, resume_data)
+        if suggestions is None:
+            suggestions = self._generate_suggestions(job_info, resume_data, match_score)
+        if ats_suggestions is None:
+            ats_suggestions = self._generate_ats_suggestions(resume_data)
+        
+        # 构建优化后的简历内容：标题和基本信息一次格式化完成
+        optimized_parts = [
+            "=== 优化后的简历 ===\n"
+            f"目标职位: {job_info.get('title', '未知职位')}\n"
+            f"目标公司: {job_info.get('company', '未知公司')}\n"
+            f"匹配度评分: {match_score}%\n"
+            f"{_SECTION_RULE}"
+        ]
         
         # 添加联系信息
         contact_info = resume_data.get("contact_info", {})
         if contact_info:
-            optimized_parts.append("【联系信息】\n")
-            if contact_info.get("name"):
-                optimized_parts.append(f"姓名: {contact_info['name']}\n")
-            if contact_info.get("email"):
-                optimized_parts.append(f"邮箱: {contact_info['email']}\n")
-            if contact_info.get("phone"):
-                optimized_parts.append(f"电话: {contact_info['phone']}\n")
-            if contact_info.get("linkedin"):
-                optimized_parts.append(f"LinkedIn: {contact_info['linkedin']}\n")
-            if contact_info.get("github"):
-                optimized_parts.append(f"GitHub: {contact_info['github']}\n")
-            optimized_parts.append("\n")
+            contact_lines = "".join(
+                f"{label}: {contact_info[key]}\n"
+                for key, label in _CONTACT_FIELDS
+                if contact_info.get(key)
+            )
+            optimized_parts.append(f"【联系信息】\n{contact_lines}\n")
         
         # 优化技能部分，确保包含职位要求的技能
         required_skills = job_info.get("key_skills", [])
         resume_skills = resume_data.get("skills", [])
         
-        # 合并技能，确保包含所有必需技能
+        # 合并技能，确保包含所有必需技能（保持原有顺序并去除重复的必需技能）
         optimized_skills = list(resume_skills)
+        seen_skills = set(optimized_skills)
         for skill in required_skills:
-            if skill not in optimized_skills:
+            if skill not in seen_skills:
+                seen_skills.add(skill)
                 optimized_skills.append(skill)
         
         if optimized_skills:
-            optimized_parts.append("【核心技能】\n")
             # 按类别分组技能（简化处理）
-            optimized_parts.append("• " + ", ".join(optimized_skills) + "\n\n")
+            optimized_parts.append(f"【核心技能】\n• {', '.join(optimized_skills)}\n\n")
         
         # 优化工作经验部分
         work_experience = resume_data.get("work_experience", [])
@@ -440,16 +689,11 @@ class ResumeOptimizer:
                 optimized_parts.append("\n")
         
         # 添加优化建议
-        optimized_parts.append("-" * 50 + "\n")
-        optimized_parts.append("【优化建议】\n")
-        suggestions = self._generate_suggestions(job_info, resume_data)
-        for i, suggestion in enumerate(suggestions, 1):
-            optimized_parts.append(f"{i}. {suggestion}\n")
+        optimized_parts.append(f"{_SECTION_RULE}【优化建议】\n")
+        optimized_parts.extend(f"{i}. {suggestion}\n" for i, suggestion in enumerate(suggestions, 1))
         
         optimized_parts.append("\n【ATS优化建议】\n")
-        ats_suggestions = self._generate_ats_suggestions(resume_data)
-        for i, suggestion in enumerate(ats_suggestions, 1):
-            optimized_parts.append(f"{i}. {suggestion}\n")
+        optimized_parts.extend(f"{i}. {suggestion}\n" for i, suggestion in enumerate(ats_suggestions, 1))
         
         return "".join(optimized_parts)
 
@@ -21,6 +21,18 @@ except LookupError:
     nltk.download('punkt')
     nltk.download('stopwords')
 
+# 常见技能关键词（扩展列表），预先计算小写形式: (技能, 小写技能)
+_COMMON_SKILLS = tuple((skill, skill.lower()) for skill in dict.fromkeys([
+    'Python', 'Java', 'JavaScript', 'C++', 'C#', 'SQL', 'PHP', 'Ruby', 'Go', 'Rust',
+    'React', 'Vue', 'Angular', 'Node.js', 'Express', 'Django', 'Flask', 'Spring', 'ASP.NET',
+    'Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP', 'Linux', 'Windows', 'macOS',
+    '数据分析', '机器学习', '深度学习', '人工智能', 'TensorFlow', 'PyTorch', 'Keras',
+    'Git', 'Jenkins', 'CI/CD', 'DevOps', 'Agile', 'Scrum', 'JIRA',
+    'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'Oracle', 'SQL Server',
+    'HTML', 'CSS', 'Bootstrap', 'jQuery', 'TypeScript', 'RESTful', 'API',
+    '数据分析', '数据科学', '统计学', 'R语言', 'Tableau', 'Power BI'
+]))
+
 class ResumeParser:
     def __init__(self):
         # 中文停用词
@@ -83,9 +95,7 @@ class ResumeParser:
         try:
             # 使用pdfplumber提取文本
             with pdfplumber.open(file_path) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    text += page.extract_text() or ""
+                text = "".join(page.extract_text() or "" for page in pdf.pages)
                 resume_data["text"] = text
             
             # 提取关键信息
@@ -251,10 +261,11 @@ class ResumeParser:
         # 找到工作经验部分
         exp_section_start = -1
         exp_section_text = ""
+        text_lower = text.lower()
         
         for keyword in self.exp_keywords:
-            if keyword.lower() in text.lower():
-                exp_section_start = text.lower().find(keyword.lower())
+            exp_section_start = text_lower.find(keyword.lower())
+            if exp_section_start != -1:
                 break
         
         if exp_section_start != -1:
@@ -263,7 +274,7 @@ class ResumeParser:
             # 查找下一个主要部分的开始位置
             next_section_keywords = self.edu_keywords + self.skill_keywords
             for keyword in next_section_keywords:
-                keyword_pos = text.lower().find(keyword.lower(), exp_section_start + 1)
+                keyword_pos = text_lower.find(keyword.lower(), exp_section_start + 1)
                 if keyword_pos != -1 and keyword_pos < exp_section_end:
                     exp_section_end = keyword_pos
             
@@ -329,10 +340,11 @@ class ResumeParser:
         # 找到教育背景部分
         edu_section_start = -1
         edu_section_text = ""
+        text_lower = text.lower()
         
         for keyword in self.edu_keywords:
-            if keyword.lower() in text.lower():
-                edu_section_start = text.lower().find(keyword.lower())
+            edu_section_start = text_lower.find(keyword.lower())
+            if edu_section_start != -1:
                 break
         
         if edu_section_start != -1:
@@ -341,7 +353,7 @@ class ResumeParser:
             # 查找下一个主要部分的开始位置
             next_section_keywords = self.skill_keywords + ['工作经历', '项目经验']
             for keyword in next_section_keywords:
-                keyword_pos = text.lower().find(keyword.lower(), edu_section_start + 1)
+                keyword_pos = text_lower.find(keyword.lower(), edu_section_start + 1)
                 if keyword_pos != -1 and keyword_pos < edu_section_end:
                     edu_section_end = keyword_pos
             
@@ -397,24 +409,13 @@ class ResumeParser:
         """
         提取技能列表
         """
-        # 常见技能关键词（扩展列表）
-        common_skills = [
-            'Python', 'Java', 'JavaScript', 'C++', 'C#', 'SQL', 'PHP', 'Ruby', 'Go', 'Rust',
-            'React', 'Vue', 'Angular', 'Node.js', 'Express', 'Django', 'Flask', 'Spring', 'ASP.NET',
-            'Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP', 'Linux', 'Windows', 'macOS',
-            '数据分析', '机器学习', '深度学习', '人工智能', 'TensorFlow', 'PyTorch', 'Keras',
-            'Git', 'Jenkins', 'CI/CD', 'DevOps', 'Agile', 'Scrum', 'JIRA',
-            'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'Oracle', 'SQL Server',
-            'HTML', 'CSS', 'Bootstrap', 'jQuery', 'TypeScript', 'RESTful', 'API',
-            '数据分析', '数据科学', '统计学', 'R语言', 'Tableau', 'Power BI'
-        ]
-        
-        found_skills = []
+        # 已找到的技能（dict 保持顺序并提供 O(1) 查重）
+        found_skills = {}
         text_lower = text.lower()
         
-        for skill in common_skills:
-            if skill.lower() in text_lower:
-                found_skills.append(skill)
+        for skill, skill_lower in _COMMON_SKILLS:
+            if skill_lower in text_lower:
+                found_skills[skill] = None
         
         # 查找技能部分并提取更多技能
         skill_section_start = -1
@@ -440,9 +441,7 @@ class ResumeParser:
                 item_clean = item.strip()
                 # 移除停用词，只保留有意义的技能词
                 if len(item_clean) > 1 and item_clean not in self.chinese_stopwords and item_clean.lower() not in self.english_stopwords:
-                    # 检查是否已经添加
-                    if item_clean not in found_skills:
-                        found_skills.append(item_clean)
+                    found_skills[item_clean] = None
             
             # 提取用逗号、分号或斜杠分隔的技能
             # 查找技能部分中的技能列表
@@ -452,13 +451,11 @@ class ResumeParser:
                     skills_in_line = re.split(r'[;、,/]', line)
                     for skill in skills_in_line:
                         skill_clean = skill.strip()
-                        if len(skill_clean) > 1 and skill_clean not in found_skills:
-                            found_skills.append(skill_clean)
-        
-        # 去重并过滤空值
-        found_skills = list(filter(None, list(set(found_skills))))
+                        if len(skill_clean) > 1:
+                            found_skills[skill_clean] = None
         
-        return found_skills
+        # 过滤空值
+        return [skill for skill in found_skills if skill]
     
     def _extract_projects(self, text: str) -> List[Dict]:
         """
@@ -1,6 +1,6 @@
 import json
 import os
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 class TemplateManager:
     """模板管理器，负责管理和操作简历模板"""
@@ -13,6 +13,8 @@ class TemplateManager:
             templates_dir: 模板文件夹路径
         """
         self.templates_dir = templates_dir
+        # 模板列表缓存: (模板目录修改时间, 模板列表)，通过本管理器修改模板时主动失效
+        self._templates_cache: Optional[Tuple[int, List[Dict]]] = None
         self._ensure_templates_dir()
     
     def _ensure_templates_dir(self):
@@ -27,11 +29,16 @@ class TemplateManager:
         Returns:
             模板列表，每个模板包含基本信息
         """
-        templates = []
+        try:
+            mtime_ns = os.stat(self.templates_dir).st_mtime_ns
+        except FileNotFoundError:
+            return []
         
-        if not os.path.exists(self.templates_dir):
-            return templates
+        # 目录未变化时直接返回缓存，避免重复列目录和解析模板文件
+        if self._templates_cache is not None and self._templates_cache[0] == mtime_ns:
+            return list(self._templates_cache[1])
         
+        templates = []
         for filename in os.listdir(self.templates_dir):
             if filename.endswith('.json'):
                 template_path = os.path.join(self.templates_dir, filename)
@@ -41,7 +48,7 @@ class TemplateManager:
                     
                     # 提取模板基本信息
                     template_info = {
-                        "id": filename.replace('.json', ''),
+                        "id": filename[:-len('.json')],
                         "title": template_data.get("title", "未知职位"),
                         "company": template_data.get("company", "未知公司"),
                         "description": template_data.get("description", "")[:100] + "..." if len(template_data.get("description", "")) > 100 else template_data.get("description", ""),
@@ -53,7 +60,8 @@ class TemplateManager:
                     print(f"读取模板文件 {filename} 失败: {str(e)}")
                     continue
         
-        return templates
+        self._templates_cache = (mtime_ns, templates)
+        return list(templates)
     
     def get_template_by_id(self, template_id: str) -> Optional[Dict]:
         """
@@ -100,6 +108,7 @@ class TemplateManager:
             with open(template_path, 'w', encoding='utf-8') as f:
                 json.dump(template_data, f, ensure_ascii=False, indent=2)
             
+            self._templates_cache = None
             return True
         except Exception as e:
             print(f"创建模板失败: {str(e)}")
@@ -131,6 +140,7 @@ class TemplateManager:
             with open(template_path, 'w', encoding='utf-8') as f:
                 json.dump(template_data, f, ensure_ascii=False, indent=2)
             
+            self._templates_cache = None
             return True
         except Exception as e:
             print(f"更新模板失败: {str(e)}")
@@ -153,6 +163,7 @@ class TemplateManager:
         
         try:
             os.remove(template_path)
+            self._templates_cache = None
             return True
         except Exception as e:
             print(f"删除模板失败: {str(e)}")
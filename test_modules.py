@@ -55,6 +55,106 @@ def test_job_analyzer():
     except Exception as e:
         print(f"职位分析模块测试失败: {e}")
 
+def test_job_analyzer_cache():
+    """测试职位分析结果缓存"""
+    print("\n=== 测试职位分析缓存 ===")
+    
+    try:
+        import job_analyzer
+    except ImportError as e:
+        print(f"职位分析模块导入失败: {e}")
+        return
+    
+    analyzer = job_analyzer.JobAnalyzer()
+    url = "https://example.com/jobs/1"
+    fetch_count = 0
+    
+    def fake_fetch(fetch_url):
+        nonlocal fetch_count
+        fetch_count += 1
+        return {"url": fetch_url, "title": "软件工程师", "key_skills": ["Python"], "requirements": []}
+    
+    analyzer._fetch_job_posting = fake_fetch
+    
+    # 有效期内命中缓存；修改返回结果不影响缓存
+    first = analyzer.analyze_job_posting(url)
+    first["key_skills"].append("Java")
+    second = analyzer.analyze_job_posting(url)
+    assert fetch_count == 1, fetch_count
+    assert second["key_skills"] == ["Python"], second["key_skills"]
+    
+    # 缓存过期后重新抓取
+    ttl = job_analyzer._JOB_CACHE_TTL
+    job_analyzer._JOB_CACHE_TTL = -1
+    try:
+        analyzer._job_cache.clear()
+        analyzer.analyze_job_posting(url)
+        analyzer.analyze_job_posting(url)
+        assert fetch_count == 3, fetch_count
+    finally:
+        job_analyzer._JOB_CACHE_TTL = ttl
+    print("职位分析缓存正常")
+
+def test_job_analyzer_errors():
+    """测试职位分析的抓取失败与解析失败"""
+    print("\n=== 测试职位分析错误 ===")
+    
+    try:
+        import requests
+        from job_analyzer import JobAnalyzer, JobFetchError, JobParseError
+    except ImportError as e:
+        print(f"职位分析模块导入失败: {e}")
+        print("请确保已安装所需依赖: pip install beautifulsoup4 requests")
+        return
+    
+    analyzer = JobAnalyzer()
+    url = "https://example.com/jobs/2"
+    
+    # 网络错误抛出 JobFetchError，且不写入缓存
+    def failing_download(download_url):
+        raise requests.ConnectionError("connection refused")
+    
+    analyzer._download = failing_download
+    try:
+        analyzer.analyze_job_posting(url)
+        raise AssertionError("应抛出 JobFetchError")
+    except JobFetchError:
+        pass
+    assert url not in analyzer._job_cache
+    
+    # 页面解析出错抛出 JobParseError
+    def failing_extract(soup):
+        raise ValueError("unexpected markup")
+    
+    analyzer._download = lambda download_url: "<html><h1>软件工程师</h1></html>".encode("utf-8")
+    analyzer._extract_requirements = failing_extract
+    try:
+        analyzer.analyze_job_posting(url)
+        raise AssertionError("应抛出 JobParseError")
+    except JobParseError:
+        pass
+    assert url not in analyzer._job_cache
+    print("职位分析错误处理正常")
+
+def test_job_key_skills():
+    """测试职位技能提取（短技能名不误判 R&D 等缩写）"""
+    print("\n=== 测试职位技能提取 ===")
+    
+    try:
+        from job_analyzer import JobAnalyzer
+    except ImportError as e:
+        print(f"职位分析模块导入失败: {e}")
+        return
+    
+    analyzer = JobAnalyzer()
+    skills = analyzer._extract_key_skills(None, "Join our R&D team. C++ and C# required.")
+    assert skills == ["C++", "C#"], skills
+    skills = analyzer._extract_key_skills(None, "<p>R&amp;D 团队</p><p>熟悉 Python</p>")
+    assert "R" not in skills and "Python" in skills, skills
+    skills = analyzer._extract_key_skills(None, "Experience with R, Go and AI in our R&D lab")
+    assert {"R", "Go", "AI"} <= set(skills), skills
+    print("职位技能提取正常")
+
 def test_resume_parser():
     """测试简历解析模块"""
     print("\n=== 测试简历解析模块 ===")
@@ -131,6 +231,118 @@ def test_resume_optimizer():
     except Exception as e:
         print(f"简历优化测试失败: {e}")
 
+def test_keyword_match_score():
+    """测试关键词匹配度（TF-IDF 余弦相似度）"""
+    print("\n=== 测试关键词匹配度 ===")
+    
+    try:
+        from resume_optimizer import ResumeOptimizer, _tfidf_cosine
+    except ImportError as e:
+        print(f"简历优化模块导入失败: {e}")
+        return
+    
+    optimizer = ResumeOptimizer()
+    job_text = "Senior Python developer with Django and PostgreSQL experience"
+    
+    # 文本完全相同时相似度约为 1
+    score, _ = optimizer._calculate_keyword_match(job_text, job_text)
+    assert abs(score - 1.0) < 1e-9, score
+    
+    # 没有共同关键词时相似度为 0
+    score, _ = optimizer._calculate_keyword_match(job_text, "Kotlin Android mobile games")
+    assert score == 0.0, score
+    assert _tfidf_cosine({}, {"python": 1}) == 0.0
+    
+    # 简历包含职位描述的全部关键词时满分
+    score, _ = optimizer._calculate_keyword_match(job_text, "I use Python, Django and PostgreSQL daily as a senior developer with years of experience")
+    assert abs(score - 1.0) < 1e-9, score
+    
+    # 不分词的中文及中英文混排文本同样能匹配
+    score, _ = optimizer._calculate_keyword_match("岗位职责：负责后端开发", "我负责后端开发工作")
+    assert score > 0.0, score
+    score, _ = optimizer._calculate_keyword_match("熟悉Python和Django框架，有MySQL经验", "三年Python开发经验，使用Django和MySQL")
+    assert score > 0.0, score
+    score, _ = optimizer._calculate_keyword_match("岗位职责：负责后端开发", "擅长平面设计与插画")
+    assert score == 0.0, score
+    print("关键词匹配度计算正常")
+
+def test_match_skills():
+    """测试技能匹配结果与逐个比较的实现一致"""
+    print("\n=== 测试技能匹配 ===")
+    
+    try:
+        from resume_optimizer import ResumeOptimizer
+    except ImportError as e:
+        print(f"简历优化模块导入失败: {e}")
+        return
+    
+    def reference(required_skills, resume_skills):
+        matched, missing = [], []
+        for skill in required_skills:
+            if any(skill.lower() in r.lower() or r.lower() in skill.lower() for r in resume_skills):
+                matched.append(skill)
+            else:
+                missing.append(skill)
+        return matched, missing
+    
+    cases = [
+        # 职位要求是简历技能的子串
+        (["Python", "SQL", "Go"], ["Python3", "MySQL", "Rust"]),
+        # 简历技能是职位要求的子串
+        (["Django REST Framework", "Spring Boot", "Vue.js"], ["django", "Spring", "React"]),
+        # 大小写混合及中文技能
+        (["JAVASCRIPT", "node.JS", "机器学习", "C++", "Kubernetes"], ["javascript", "Node.js", "学习", "c++", "k8s"]),
+        # 空列表
+        (["Python"], []),
+        ([], ["Python"]),
+    ]
+    for required_skills, resume_skills in cases:
+        assert ResumeOptimizer._match_skills(required_skills, resume_skills) == reference(required_skills, resume_skills), \
+            (required_skills, resume_skills)
+    print("技能匹配结果正常")
+
+def test_database_search():
+    """测试生成历史搜索（全文索引与 LIKE 回退）"""
+    print("\n=== 测试生成历史搜索 ===")
+    
+    try:
+        from database_manager import DatabaseManager
+    except ImportError as e:
+        print(f"数据库模块导入失败: {e}")
+        return
+    
+    import tempfile
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseManager(os.path.join(tmp_dir, "test.db"))
+        try:
+            python_id = db.save_generation_record("Python后端工程师", "某某科技", "description", {}, "a.pdf")
+            db.save_generation_record("前端开发", "ABC网络", "url", {}, "b.pdf")
+            db.save_generation_record("数据分析师", "某某科技", "template", {}, "c.pdf")
+            
+            def titles(keyword):
+                return sorted(record["job_title"] for record in db.search_generation_history(keyword))
+            
+            # 3个及以上字符走 trigram 全文索引（不区分大小写），1-2个字符回退到 LIKE
+            assert titles("python") == ["Python后端工程师"], titles("python")
+            assert titles("ABC网络") == ["前端开发"], titles("ABC网络")
+            assert titles("某某") == ["Python后端工程师", "数据分析师"], titles("某某")
+            assert titles("前") == ["前端开发"], titles("前")
+            assert titles("不存在的职位") == []
+            
+            # 更新、删除通过触发器同步到全文索引
+            with db._lock, db._conn:
+                db._conn.execute("UPDATE generation_history SET job_title = ? WHERE id = ?",
+                                 ("Golang后端工程师", python_id))
+            assert titles("python") == []
+            assert titles("golang") == ["Golang后端工程师"], titles("golang")
+            assert db.delete_generation_record(python_id)
+            assert titles("golang") == []
+            assert titles("后端工程师") == []
+        finally:
+            db.close()
+    print("生成历史搜索正常")
+
 def test_resume_generator():
     """测试简历生成模块"""
     print("\n=== 测试简历生成模块 ===")
@@ -151,8 +363,14 @@ def main():
     print("开始测试简历助手各模块功能...\n")
     
     test_job_analyzer()
+    test_job_analyzer_cache()
+    test_job_analyzer_errors()
+    test_job_key_skills()
     test_resume_parser()
     test_resume_optimizer()
+    test_keyword_match_score()
+    test_match_skills()
+    test_database_search()
     test_resume_generator()
     
     print("\n测试完成!")
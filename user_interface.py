@@ -3,23 +3,67 @@
 实现多种简历生成方式的统一接口
 """
 
-from typing import Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+from config import Config
 from job_analyzer import JobAnalyzer
 from resume_parser import ResumeParser
 from resume_optimizer import ResumeOptimizer
 from resume_generator import ResumeGenerator
+from models import UserResumeManager
 import json
+import multiprocessing
+import orjson
 import os
+import threading
 import uuid
 
+# 与简历解析并行执行的职位抓取任务线程数
+_JOB_FETCH_WORKERS = 4
+
+# 简历解析进程池大小：PDF/DOCX 解析是 CPU 密集型任务，放到子进程中执行，避免与其他请求争抢 GIL；
+# 每个服务器工作进程各有一个进程池，按工作进程数平分CPU核数
+_PARSE_WORKERS = Config.PROCESS_POOL_WORKERS
+
+# 子进程中复用的简历解析器
+_worker_parser: Optional[ResumeParser] = None
+
+def _parse_resume_in_worker(file_path: str, file_type: str) -> Dict:
+    """
+    在解析进程池中执行的简历解析，每个子进程只创建一次解析器
+    
+    Args:
+        file_path: 简历文件路径
+        file_type: 文件类型
+        
+    Returns:
+        包含简历信息的字典
+    """
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = ResumeParser()
+    return _worker_parser.parse_resume(file_path, file_type)
+
 class UserInterface:
-    def __init__(self):
+    def __init__(self, user_manager: Optional[UserResumeManager] = None):
+        """
+        Args:
+            user_manager: 用户简历管理器，传入时与调用方共用（包括其用户信息缓存）
+        """
         self.job_analyzer = JobAnalyzer()
         self.resume_parser = ResumeParser()
         self.resume_optimizer = ResumeOptimizer()
         self.resume_generator = ResumeGenerator()
+        self.user_manager = user_manager or UserResumeManager()
         self.templates_dir = "templates"
         self.history_file = "generation_history.json"
+        # 历史记录缓存: ((st_mtime_ns, st_size), 历史记录列表)，文件变化时重新读取
+        self._history_cache: Optional[Tuple[Tuple[int, int], List[Dict]]] = None
+        self._history_lock = threading.Lock()
+        self._job_fetch_executor = ThreadPoolExecutor(max_workers=_JOB_FETCH_WORKERS)
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self._parse_pool_lock = threading.Lock()
         
         # 确保模板目录存在
         if not os.path.exists(self.templates_dir):
@@ -54,7 +98,7 @@ class UserInterface:
             
             # 解析用户简历
             if resume_file:
-                resume_data = self.resume_parser.parse_resume(resume_file, file_type)
+                resume_data = self._parse_resume(resume_file, file_type)
             else:
                 # 如果没有上传简历，尝试从用户资料获取信息
                 resume_data = self._get_user_resume_data(user_id)
@@ -113,16 +157,18 @@ class UserInterface:
             if file_type is None:
                 file_type = resume_file.split('.')[-1] if '.' in resume_file else 'pdf'
             
-            # 分析职位信息
-            job_info = self.job_analyzer.analyze_job_posting(job_url)
+            # 分析职位信息（网络请求）与解析简历相互独立，在后台线程中并行抓取职位页面
+            job_future = self._job_fetch_executor.submit(self.job_analyzer.analyze_job_posting, job_url)
             
             # 解析用户简历
             if resume_file:
-                resume_data = self.resume_parser.parse_resume(resume_file, file_type)
+                resume_data = self._parse_resume(resume_file, file_type)
             else:
                 # 如果没有上传简历，尝试从用户资料获取信息
                 resume_data = self._get_user_resume_data(user_id)
             
+            job_info = job_future.result()
+            
             # 优化简历
             optimization_result = self.resume_optimizer.optimize_resume(job_info, resume_data)
             
@@ -191,7 +237,7 @@ class UserInterface:
             
             # 解析用户简历
             if resume_file:
-                resume_data = self.resume_parser.parse_resume(resume_file, file_type)
+                resume_data = self._parse_resume(resume_file, file_type)
             else:
                 # 如果没有上传简历，尝试从用户资料获取信息
                 resume_data = self._get_user_resume_data(user_id)
@@ -236,6 +282,45 @@ class UserInterface:
                 "message": f"简历生成失败: {str(e)}"
             }
     
+    def _get_parse_pool(self) -> ProcessPoolExecutor:
+        """获取简历解析进程池（首次使用时创建）"""
+        with self._parse_pool_lock:
+            if self._parse_pool is None:
+                # 服务进程中存在多个线程，使用 spawn 而不是 fork 创建子进程
+                self._parse_pool = ProcessPoolExecutor(
+                    max_workers=_PARSE_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._parse_pool
+    
+    def shutdown(self):
+        """关闭进程池和线程池（服务关闭时调用）"""
+        with self._parse_pool_lock:
+            parse_pool, self._parse_pool = self._parse_pool, None
+        if parse_pool is not None:
+            parse_pool.shutdown(wait=False, cancel_futures=True)
+        self._job_fetch_executor.shutdown(wait=False, cancel_futures=True)
+        self.resume_optimizer.close()
+        self.resume_generator.close()
+    
+    def _parse_resume(self, resume_file: str, file_type: str) -> Dict:
+        """
+        在进程池中解析简历，进程池不可用时在当前线程中解析
+        
+        Args:
+            resume_file: 简历文件路径
+            file_type: 文件类型
+            
+        Returns:
+            包含简历信息的字典
+        """
+        try:
+            return self._get_parse_pool().submit(_parse_resume_in_worker, resume_file, file_type).result()
+        except BrokenProcessPool:
+            with self._parse_pool_lock:
+                self._parse_pool = None
+            return self.resume_parser.parse_resume(resume_file, file_type)
+    
     def _generate_multiple_formats(self, optimized_content: str, job_info: Dict, resume_data: Dict) -> 'ResumeFormats':
         """
         生成多种格式的简历
@@ -248,7 +333,6 @@ class UserInterface:
         Returns:
             包含多种格式路径的ResumeFormats对象
         """
-        import uuid
         from models import ResumeFormats
         
         # 生成唯一标识符
@@ -433,16 +517,17 @@ class UserInterface:
         </div>
                 """
         
+        match_score = self.resume_optimizer._calculate_match_score(job_info, resume_data)
         html_content += """
     </div>
     
     <div class="section">
         <h2>优化建议</h2>
-        <h3>匹配度评分: """ + str(self.resume_optimizer._calculate_match_score(job_info, resume_data)) + """%</h3>
+        <h3>匹配度评分: """ + str(match_score) + """%</h3>
         """
         
         # 添加优化建议
-        suggestions = self.resume_optimizer._generate_suggestions(job_info, resume_data)
+        suggestions = self.resume_optimizer._generate_suggestions(job_info, resume_data, match_score)
         if suggestions:
             html_content += "<ul>\n"
             for suggestion in suggestions:
@@ -511,13 +596,30 @@ class UserInterface:
             历史记录列表
         """
         try:
-            if os.path.exists(self.history_file):
-                with open(self.history_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return []
+            with self._history_lock:
+                return list(self._load_history())
         except Exception:
             return []
     
+    def _load_history(self) -> List[Dict]:
+        """
+        读取历史记录文件，文件未变化时返回缓存的列表（调用方需持有 _history_lock）
+        
+        Returns:
+            历史记录列表
+        """
+        try:
+            st = os.stat(self.history_file)
+        except FileNotFoundError:
+            return []
+        
+        key = (st.st_mtime_ns, st.st_size)
+        if self._history_cache is None or self._history_cache[0] != key:
+            with open(self.history_file, 'rb') as f:
+                raw = f.read()
+            self._history_cache = (key, orjson.loads(raw) if raw.strip() else [])
+        return self._history_cache[1]
+    
     def _extract_requirements_from_description(self, description: str) -> List[str]:
         """
         从职位描述中提取要求
@@ -581,9 +683,7 @@ class UserInterface:
         """
         if user_id:
             try:
-                from models import UserResumeManager
-                user_manager = UserResumeManager()
-                user_profile = user_manager.get_user(user_id)
+                user_profile = self.user_manager.get_user(user_id)
                 
                 if user_profile:
                     # 将用户资料转换为简历数据格式
@@ -638,19 +738,21 @@ class UserInterface:
             import datetime
             record["timestamp"] = datetime.datetime.now().isoformat()
             
-            history = []
-            if os.path.exists(self.history_file):
-                with open(self.history_file, 'r', encoding='utf-8') as f:
-                    history = json.load(f)
-            
-            history.append(record)
-            
-            # 只保留最近100条记录
-            if len(history) > 100:
-                history = history[-100:]
-            
-            with open(self.history_file, 'w', encoding='utf-8') as f:
-                json.dump(history, f, ensure_ascii=False, indent=2)
+            with self._history_lock:
+                history = self._load_history() + [record]
+                
+                # 只保留最近100条记录
+                if len(history) > 100:
+                    history = history[-100:]
+                
+                # 先写临时文件再原子替换，读取方不会看到写了一半的文件
+                tmp_path = f"{self.history_file}.{os.getpid()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(orjson.dumps(history, option=orjson.OPT_INDENT_2))
+                os.replace(tmp_path, self.history_file)
+                
+                st = os.stat(self.history_file)
+                self._history_cache = ((st.st_mtime_ns, st.st_size), history)
         except Exception:
             # 如果保存失败，不抛出异常，不影响主功能
             pass